@@ -0,0 +1,36 @@
+# _entropy_numba.py - Shannon entropy kernel, compiled with Numba when available
+
+import math
+import numpy as np
+
+try:
+    import numba
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# 1 / ln(2)
+_INV_LN2 = 1.4426950408889634
+
+
+def _entropy_loop(counts, total):
+    """H = -Σ (c/total) × log₂(c/total) as a tight loop for Numba to compile"""
+    entropy = 0.0
+    for c in counts:
+        if c > 0:
+            p = c / total
+            entropy -= p * math.log(p)
+    # log₂(p) = ln(p) / ln(2), factored out of the sum
+    return entropy * _INV_LN2
+
+
+def _entropy_numpy(counts, total):
+    """H = -Σ (c/total) × log₂(c/total), vectorized with NumPy"""
+    p = counts[counts > 0] / total
+    return float(-np.sum(p * np.log(p)) * _INV_LN2)
+
+
+if _HAS_NUMBA:
+    entropy_from_counts = numba.njit(cache=True, fastmath=True)(_entropy_loop)
+else:
+    entropy_from_counts = _entropy_numpy
@@ -1,35 +1,139 @@
 # decision_engine.py - Optimized Decision Engine for EU AI Act
 
+import ast
+import sys
 from dataclasses import dataclass
-from typing import Dict, List, Set, Optional, Any, Tuple
-from enum import Enum
+from typing import Dict, List, Set, FrozenSet, Optional, Any, Tuple, Callable
+from enum import Enum, IntFlag
 from optimizer import State, Answer, Question, QuestionType, DecisionTreeOptimizer
 
+try:
+    import numba
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+# Multiple-choice answers are stored as frozensets of option values
+_EMPTY = frozenset()
+_NONE = frozenset(('none',))
+_TERMINAL_FLAGS = ('flag_out_of_scope', 'flag_excluded', 'flag_prohibited')
+_TERMINAL_GATE = 1
+_ANNEX_I = frozenset(('annex_i_section_a', 'annex_i_section_b'))
+_ANNEX_III = frozenset(f'annex_iii_{cat}' for cat in [
+    'biometrics', 'critical_infra', 'education', 'employment',
+    'essential_services', 'law_enforcement', 'migration', 'justice'])
+
+def _intern(value: Any) -> Any:
+    """Intern string answer values so comparisons start with an identity check"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Obligation(IntFlag):
+    """Obligations the inference rules can derive, packed as bits of the flag mask"""
+    AI_LITERACY = 1 << 0
+    GPAI_BASE = 1 << 1
+    GPAI_SYSTEMIC = 1 << 2
+    PROVIDER_HIGH_RISK = 1 << 3
+    DEPLOYER_HIGH_RISK = 1 << 4
+    HANDOVER = 1 << 5
+    FUNDAMENTAL_RIGHTS_ASSESSMENT = 1 << 6
+    TRANSPARENCY_NATURAL_PERSONS = 1 << 7
+    TRANSPARENCY_SYNTHETIC_CONTENT = 1 << 8
+    TRANSPARENCY_EMOTION_BIOMETRIC = 1 << 9
+    TRANSPARENCY_CONTENT_RESEMBLANCE = 1 << 10
+
+# Decode table from Obligation bits to the public obligation names
+_OBLIGATION_DECODE = tuple(sorted(
+    (f'obligation_{name.lower()}', int(member))
+    for name, member in Obligation.__members__.items()))
+_OBLIGATION_BITS = {name: bit for name, bit in _OBLIGATION_DECODE}
+_ALL_OBLIGATIONS = sum(_OBLIGATION_BITS.values())
+
+def _decode_obligations(mask: int) -> Set[str]:
+    """Obligation names for the Obligation bits set in a mask"""
+    return {name for name, bit in _OBLIGATION_DECODE if mask & bit}
+
 class DecisionResult(Enum):
     OUT_OF_SCOPE = "out_of_scope"
     EXCLUDED = "excluded"
     PROHIBITED = "prohibited"
     COMPLIANCE_REQUIRED = "compliance_required"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ComplianceResult:
     """Final compliance determination"""
     result: DecisionResult
     flags: Dict[str, bool]
-    obligations: Set[str]
+    obligations: FrozenSet[str]
     questions_asked: int
-    path_taken: List[str]
+    path_taken: Tuple[str, ...]
     explanation: str
 
+# Explanations for the terminal results, in the order they take precedence
+_TERMINAL_EXPLANATIONS = {
+    DecisionResult.OUT_OF_SCOPE: "System is outside the scope of the EU AI Act",
+    DecisionResult.EXCLUDED: "System is excluded from EU AI Act requirements",
+    DecisionResult.PROHIBITED: "System performs prohibited functions and cannot be placed on EU market",
+}
+
 class OptimizedDecisionEngine:
     """Optimized decision engine for EU AI Act compliance"""
+
+    # Order in which get_next_question considers the questions
+    _QUESTION_ORDER = ('Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q5A', 'Q6', 'Q6A', 'Q6B', 'Q7', 'Q8', 'Q9')
+
+    # Questions that must be considered before each question because its
+    # skip logic depends on their answers or on flags derived from them
+    _QUESTION_DEPENDENCIES = {
+        'Q5A': ('Q5',),
+        'Q6A': ('Q6',),
+        'Q6B': ('Q6', 'Q6A'),
+        'Q8': ('Q2', 'Q6A', 'Q6B'),
+        'Q9': ('Q2', 'Q6A', 'Q6B'),
+    }
+
+    # Conditions get_next_question depends on besides which questions are
+    # already answered. The rule evaluator packs them into a bitmask that,
+    # together with the answered-question mask, keys the next-question table.
+    # The first gate (_TERMINAL_GATE) marks a terminal result.
+    _QUESTION_GATES = (
+        " or ".join(_TERMINAL_FLAGS),
+        "Q5 == 'yes_gpai'",
+        "Q6 & ANNEX_I",
+        "Q6 & ANNEX_III",
+        "Q6 - NONE",
+        "flag_is_provider",
+        "flag_is_product_manufacturer",
+        "flag_high_risk",
+        "flag_is_deployer",
+    )
     
-    def __init__(self):
+    def __init__(self, profile_guided_order: bool = False):
+        """
+        Args:
+            profile_guided_order: Consider questions by descending
+                terminal_probability x information_gain (subject to
+                _QUESTION_DEPENDENCIES) instead of _QUESTION_ORDER, so that
+                assessments likely to end early do so after fewer questions
+        """
         self.optimizer = DecisionTreeOptimizer()
+        self._profile_guided_order = profile_guided_order
         self.questions = self._initialize_questions()
         self._initialize_inference_rules()
+        self._next_q_table: Dict[int, Optional[int]] = {}
         self.current_state = State()
         self.path: List[str] = []
+        self._answered_mask = 0
+        self._answer_mask = 0
+        self._flag_mask = 0
+        self._gate_mask = 0
+        # Terminal result, set by answer_question as soon as one is derived
+        self._terminal: Optional[DecisionResult] = None
         
     def _initialize_questions(self) -> Dict[str, Question]:
         """Initialize optimized question set"""
@@ -217,275 +321,541 @@ class OptimizedDecisionEngine:
             )
         }
         
-        # Register questions with optimizer
+        # Register questions with optimizer; option values are interned so
+        # comparisons against (interned) answers hit the identity fast path
         for q in questions.values():
+            for option in q.options:
+                option['value'] = sys.intern(option['value'])
             self.optimizer.add_question(q)
+
+        # Additional skip logic for conditional questions, beyond their
+        # skip_conditions. Each check gets the state and the Q6 answer (a
+        # frozenset, empty if unanswered), which the scan looks up once.
+        self._extra_skip: Dict[str, Callable[[State, frozenset], bool]] = {
+            'Q5A': lambda st, q6: st.get_answer('Q5') != 'yes_gpai',
+            # Q6A is only for Annex I (section A or B) - products requiring conformity assessment
+            'Q6A': lambda st, q6: not q6 & _ANNEX_I,
+            'Q6B': self._skip_q6b,
+            # Skip Q8 if already a provider (original provider doesn't need modification check)
+            'Q8': lambda st, q6: st.get_flag('flag_is_provider') and
+                                 not st.get_flag('flag_is_product_manufacturer'),
+            'Q9': lambda st, q6: not (st.get_flag('flag_high_risk') and st.get_flag('flag_is_deployer')),
+        }
+
+        # Parallel arrays over the questions in scan order, so the
+        # next-question scan only touches the fields it needs
+        if self._profile_guided_order:
+            self.question_order = self._profile_guided_question_order(questions)
+        else:
+            self.question_order = self._QUESTION_ORDER
+        self._q_ids = self.question_order
+        self._q_bits = tuple(1 << i for i in range(len(self._q_ids)))
+        self._q_skip_fn = tuple(questions[q_id].is_skippable for q_id in self._q_ids)
+        self._q_extra_skip = tuple(self._extra_skip.get(q_id) for q_id in self._q_ids)
+        self._q_obj = tuple(questions[q_id] for q_id in self._q_ids)
+        self._question_bits = dict(zip(self._q_ids, self._q_bits))
         
         return questions
     
-    def _has_non_none_answer(self, answer) -> bool:
-        """Check if answer contains non-'none' values (handles both list and string)"""
-        if answer is None:
-            return False
-        if isinstance(answer, list):
-            return any(v != 'none' for v in answer)
-        return answer != 'none'
-
-    def _answer_contains(self, answer, value: str) -> bool:
-        """Check if answer contains a specific value (handles both list and string)"""
-        if answer is None:
-            return False
-        if isinstance(answer, list):
-            return value in answer
-        return answer == value or value in str(answer)
+    def _profile_guided_question_order(self, questions: Dict[str, Question]) -> Tuple[str, ...]:
+        """
+        Order questions by descending terminal_probability x information_gain.
+
+        A topological sort over _QUESTION_DEPENDENCIES: at each step the
+        highest-scoring question whose dependencies are already placed comes
+        next, with ties kept in _QUESTION_ORDER.
+        """
+        def score(q_id: str) -> float:
+            return questions[q_id].terminal_probability * questions[q_id].information_gain
+
+        order: List[str] = []
+        pending = sorted(self._QUESTION_ORDER, key=lambda q_id: -score(q_id))
+        while pending:
+            q_id = next(q for q in pending
+                        if all(dep in order for dep in self._QUESTION_DEPENDENCIES.get(q, ())))
+            order.append(q_id)
+            pending.remove(q_id)
+        return tuple(order)
+
+    def _skip_q6b(self, state: State, q6: frozenset) -> bool:
+        """Q6B is for Annex III use cases (skip if none selected or only Annex I with Q6A already answered)"""
+        # Skip if unanswered or just 'none'
+        if not q6 - _NONE:
+            return True
+        # Also skip if there are no Annex III selections and Q6A is already answered
+        if state.get_answer('Q6A') is not None and not q6 & _ANNEX_III:
+            return True
+        return False
+
+    def _normalize_answer(self, question_id: str, answer_value: Any) -> Any:
+        """Store multiple-choice answers as frozensets of (interned) option values"""
+        question = self.questions.get(question_id)
+        if question is None or question.question_type != QuestionType.MULTIPLE_CHOICE:
+            return _intern(answer_value)
+        if isinstance(answer_value, (list, tuple, set, frozenset)):
+            return frozenset(_intern(v) for v in answer_value)
+        return frozenset((_intern(answer_value),))
 
     def _initialize_inference_rules(self):
-        """Initialize inference rules for deriving flags and obligations"""
+        """Initialize inference rules for deriving flags and obligations
 
-        # Rule: Provider → AI Literacy
-        self.optimizer.add_inference_rule(
-            'provider_ai_literacy',
-            lambda s: self._answer_contains(s.get_answer('Q2'), 'provider'),
-            {'flag_is_provider': True, 'obligation_ai_literacy': True}
-        )
+        Each condition is a Python expression over the answers (bound to
+        their question ids; multiple-choice answers are frozensets, and
+        unanswered questions are an empty frozenset) and the flags (bound to
+        their flag names). The expressions are compiled once into a single
+        evaluator by _compile_rules().
 
-        # Rule: Deployer → AI Literacy
-        self.optimizer.add_inference_rule(
-            'deployer_ai_literacy',
-            lambda s: self._answer_contains(s.get_answer('Q2'), 'deployer'),
-            {'flag_is_deployer': True, 'obligation_ai_literacy': True}
-        )
+        Rules must be monotonic: they only ever set flags to True and never
+        clear them. The rules are sorted so that every rule comes after the
+        rules setting the flags it reads, which lets one pass in that order
+        reach the same result as iterating to a fixed point.
+        """
+        self.inference_rules: List[Tuple[str, str, Dict[str, Any]]] = [
+            # Rule: Provider → AI Literacy
+            ('provider_ai_literacy', "'provider' in Q2",
+             {'flag_is_provider': True, 'obligation_ai_literacy': True}),
 
-        # Rule: Distributor
-        self.optimizer.add_inference_rule(
-            'distributor',
-            lambda s: self._answer_contains(s.get_answer('Q2'), 'distributor'),
-            {'flag_is_distributor': True}
-        )
+            # Rule: Deployer → AI Literacy
+            ('deployer_ai_literacy', "'deployer' in Q2",
+             {'flag_is_deployer': True, 'obligation_ai_literacy': True}),
 
-        # Rule: Importer
-        self.optimizer.add_inference_rule(
-            'importer',
-            lambda s: self._answer_contains(s.get_answer('Q2'), 'importer'),
-            {'flag_is_importer': True}
-        )
+            # Rule: Distributor
+            ('distributor', "'distributor' in Q2",
+             {'flag_is_distributor': True}),
 
-        # Rule: Product Manufacturer
-        self.optimizer.add_inference_rule(
-            'product_manufacturer',
-            lambda s: self._answer_contains(s.get_answer('Q2'), 'product_manufacturer'),
-            {'flag_is_product_manufacturer': True}
-        )
+            # Rule: Importer
+            ('importer', "'importer' in Q2",
+             {'flag_is_importer': True}),
 
-        # Rule: No EU connection → Out of scope
-        self.optimizer.add_inference_rule(
-            'out_of_scope',
-            lambda s: s.get_answer('Q1') == 'no_eu_connection',
-            {'flag_out_of_scope': True}
-        )
+            # Rule: Product Manufacturer
+            ('product_manufacturer', "'product_manufacturer' in Q2",
+             {'flag_is_product_manufacturer': True}),
 
-        # Rule: Exclusions → Excluded
-        self.optimizer.add_inference_rule(
-            'excluded',
-            lambda s: self._has_non_none_answer(s.get_answer('Q3')),
-            {'flag_excluded': True}
-        )
+            # Rule: No EU connection → Out of scope
+            ('out_of_scope', "Q1 == 'no_eu_connection'",
+             {'flag_out_of_scope': True}),
 
-        # Rule: Prohibited functions → Prohibited
-        self.optimizer.add_inference_rule(
-            'prohibited',
-            lambda s: self._has_non_none_answer(s.get_answer('Q4')),
-            {'flag_prohibited': True}
-        )
-        
-        # Rule: GPAI → GPAI obligations
-        self.optimizer.add_inference_rule(
-            'gpai_base',
-            lambda s: s.get_answer('Q5') == 'yes_gpai',
-            {'flag_gpai': True, 'obligation_gpai_base': True}
-        )
-        
-        # Rule: GPAI systemic risk
-        self.optimizer.add_inference_rule(
-            'gpai_systemic',
-            lambda s: s.get_answer('Q5A') == 'yes_systemic',
-            {'flag_gpai_systemic_risk': True, 'obligation_gpai_systemic': True}
-        )
-        
-        # Rule: High-risk determination
-        self.optimizer.add_inference_rule(
-            'high_risk_annex_i',
-            lambda s: (s.get_answer('Q6A') == 'yes_required'),
-            {'flag_high_risk': True}
-        )
-        
-        self.optimizer.add_inference_rule(
-            'high_risk_annex_iii',
-            lambda s: (s.get_answer('Q6B') == 'yes_significant'),
-            {'flag_high_risk': True}
-        )
-        
-        # Rule: High-risk provider obligations
-        self.optimizer.add_inference_rule(
-            'provider_high_risk_obligations',
-            lambda s: s.get_flag('flag_high_risk') and s.get_flag('flag_is_provider'),
-            {'obligation_provider_high_risk': True}
-        )
-        
-        # Rule: High-risk deployer obligations
-        self.optimizer.add_inference_rule(
-            'deployer_high_risk_obligations',
-            lambda s: s.get_flag('flag_high_risk') and s.get_flag('flag_is_deployer'),
-            {'obligation_deployer_high_risk': True}
-        )
+            # Rule: Exclusions → Excluded
+            ('excluded', "Q3 - NONE",
+             {'flag_excluded': True}),
 
-        # Rule: Product manufacturer with high-risk AI becomes provider (Article 25)
-        self.optimizer.add_inference_rule(
-            'product_manufacturer_becomes_provider',
-            lambda s: s.get_flag('flag_is_product_manufacturer') and s.get_flag('flag_high_risk'),
-            {'flag_becomes_provider': True, 'flag_is_provider': True}
-        )
+            # Rule: Prohibited functions → Prohibited
+            ('prohibited', "Q4 - NONE",
+             {'flag_prohibited': True}),
 
-        # Rule: Modifications → Becomes provider
-        self.optimizer.add_inference_rule(
-            'becomes_provider',
-            lambda s: self._has_non_none_answer(s.get_answer('Q8')),
-            {'flag_becomes_provider': True, 'flag_is_provider': True, 'obligation_handover': True}
-        )
+            # Rule: GPAI → GPAI obligations
+            ('gpai_base', "Q5 == 'yes_gpai'",
+             {'flag_gpai': True, 'obligation_gpai_base': True}),
 
-        # Rule: Public body + high-risk → Fundamental rights assessment
-        self.optimizer.add_inference_rule(
-            'fundamental_rights',
-            lambda s: (s.get_answer('Q9') == 'yes_public' and
-                      s.get_flag('flag_high_risk') and
-                      s.get_flag('flag_is_deployer')),
-            {'obligation_fundamental_rights_assessment': True}
-        )
+            # Rule: GPAI systemic risk
+            ('gpai_systemic', "Q5A == 'yes_systemic'",
+             {'flag_gpai_systemic_risk': True, 'obligation_gpai_systemic': True}),
 
-        # Rule: Transparency - Natural persons
-        self.optimizer.add_inference_rule(
-            'transparency_natural',
-            lambda s: self._answer_contains(s.get_answer('Q7'), 'interact_with_people'),
-            {'obligation_transparency_natural_persons': True}
-        )
+            # Rule: High-risk determination
+            ('high_risk_annex_i', "Q6A == 'yes_required'",
+             {'flag_high_risk': True}),
 
-        # Rule: Transparency - Synthetic content
-        self.optimizer.add_inference_rule(
-            'transparency_synthetic',
-            lambda s: self._answer_contains(s.get_answer('Q7'), 'generate_synthetic_content'),
-            {'obligation_transparency_synthetic_content': True}
-        )
+            ('high_risk_annex_iii', "Q6B == 'yes_significant'",
+             {'flag_high_risk': True}),
 
-        # Rule: Transparency - Emotion & biometric
-        self.optimizer.add_inference_rule(
-            'transparency_emotion',
-            lambda s: self._answer_contains(s.get_answer('Q7'), 'emotion_recognition'),
-            {'obligation_transparency_emotion_biometric': True}
-        )
+            # Rule: High-risk provider obligations
+            ('provider_high_risk_obligations', "flag_high_risk and flag_is_provider",
+             {'obligation_provider_high_risk': True}),
 
-        # Rule: Transparency - Content resemblance (deepfake or text manipulation)
-        self.optimizer.add_inference_rule(
-            'transparency_deepfake',
-            lambda s: (self._answer_contains(s.get_answer('Q7'), 'deepfake') or
-                      self._answer_contains(s.get_answer('Q7'), 'text_manipulation_public')),
-            {'obligation_transparency_content_resemblance': True}
-        )
+            # Rule: High-risk deployer obligations
+            ('deployer_high_risk_obligations', "flag_high_risk and flag_is_deployer",
+             {'obligation_deployer_high_risk': True}),
+
+            # Rule: Product manufacturer with high-risk AI becomes provider (Article 25)
+            ('product_manufacturer_becomes_provider',
+             "flag_is_product_manufacturer and flag_high_risk",
+             {'flag_becomes_provider': True, 'flag_is_provider': True}),
+
+            # Rule: Modifications → Becomes provider
+            ('becomes_provider', "Q8 - NONE",
+             {'flag_becomes_provider': True, 'flag_is_provider': True, 'obligation_handover': True}),
+
+            # Rule: Public body + high-risk → Fundamental rights assessment
+            ('fundamental_rights',
+             "Q9 == 'yes_public' and flag_high_risk and flag_is_deployer",
+             {'obligation_fundamental_rights_assessment': True}),
+
+            # Rule: Transparency - Natural persons
+            ('transparency_natural', "'interact_with_people' in Q7",
+             {'obligation_transparency_natural_persons': True}),
+
+            # Rule: Transparency - Synthetic content
+            ('transparency_synthetic', "'generate_synthetic_content' in Q7",
+             {'obligation_transparency_synthetic_content': True}),
+
+            # Rule: Transparency - Emotion & biometric
+            ('transparency_emotion', "'emotion_recognition' in Q7",
+             {'obligation_transparency_emotion_biometric': True}),
+
+            # Rule: Transparency - Content resemblance (deepfake or text manipulation)
+            ('transparency_deepfake', "'deepfake' in Q7 or 'text_manipulation_public' in Q7",
+             {'obligation_transparency_content_resemblance': True}),
+        ]
+
+        self._rule_namespace = {'NONE': _NONE, 'ANNEX_I': _ANNEX_I, 'ANNEX_III': _ANNEX_III}
+        self.inference_rules = self._sort_rules(self.inference_rules)
+        # The engine itself derives flags with the packed kernel below and
+        # never applies rules through the optimizer; these registrations
+        # only serve outside users of engine.optimizer.apply_inference_rules
+        for name, condition, effects in self.inference_rules:
+            code = compile(condition, f'<rule {name}>', 'eval')
+            declarative = self._declarative_condition(condition)
+            self.optimizer.add_inference_rule(
+                name, declarative if declarative is not None else self._state_predicate(code),
+                effects, reads={n for n in code.co_names if n.startswith('flag_')})
+
+        self._assign_bits()
+        self._rules_kernel = self._compile_rules()
+        # Compiled on first use by batch_evaluate
+        self._batch_kernel = None
+
+    @staticmethod
+    def _sort_rules(rules: List[Tuple[str, str, Dict[str, Any]]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Order rules so each one follows the rules writing the flags it reads"""
+        reads = {name: {n for n in compile(condition, '<rule>', 'eval').co_names
+                        if n.startswith('flag_')}
+                 for name, condition, _ in rules}
+        writes = {name: {key for key in effects if key.startswith('flag_')}
+                  for name, _, effects in rules}
+
+        ordered = []
+        pending = list(rules)
+        while pending:
+            # Take the first rule (in declaration order) none of whose reads
+            # is still written by another pending rule
+            for rule in pending:
+                name = rule[0]
+                if not any(reads[name] & writes[other[0]]
+                           for other in pending if other is not rule):
+                    break
+            else:
+                raise ValueError(f"Inference rules have a dependency cycle: "
+                                 f"{[rule[0] for rule in pending]}")
+            ordered.append(rule)
+            pending.remove(rule)
+        return ordered
+
+    @staticmethod
+    def _declarative_condition(condition: str) -> Optional[Dict[str, bool]]:
+        """Required flags for a condition that is a conjunction of flags, else None"""
+        node = ast.parse(condition, mode='eval').body
+        names = node.values if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And) else [node]
+        if all(isinstance(n, ast.Name) and n.id.startswith('flag_') for n in names):
+            return {n.id: True for n in names}
+        return None
+
+    def _state_predicate(self, code) -> Callable[[State], bool]:
+        """Wrap a compiled rule condition as a State predicate for the optimizer
+
+        Only outside users of engine.optimizer evaluate these predicates;
+        answer_question uses the compiled rules kernel instead, so the two
+        must be kept equivalent.
+        """
+        answer_names = [n for n in code.co_names if n in self.questions]
+        flag_names = [n for n in code.co_names if n.startswith('flag_')]
+
+        def condition(s: State) -> bool:
+            env = {n: s.get_answer(n) or _EMPTY for n in answer_names}
+            env.update((n, s.get_flag(n)) for n in flag_names)
+            return eval(code, self._rule_namespace, env)
+
+        return condition
+
+    def _assign_bits(self):
+        """
+        Assign bit positions for the packed rule kernel.
+
+        The answer mask has one bit per (question, option value) pair; the
+        flag mask holds the Obligation bits in its low bits and one bit per
+        flag the rules derive above them.
+        """
+        self._answer_bit: Dict[Tuple[str, str], int] = {}
+        self._question_answer_bits: Dict[str, int] = {}
+        for q_id, question in self.questions.items():
+            for option in question.options:
+                bit = 1 << len(self._answer_bit)
+                self._answer_bit[q_id, option['value']] = bit
+                self._question_answer_bits[q_id] = self._question_answer_bits.get(q_id, 0) | bit
+
+        names = {key for _, _, effects in self.inference_rules for key in effects}
+        for gate in self._QUESTION_GATES:
+            names.update(n for n in compile(gate, '<gate>', 'eval').co_names
+                         if n.startswith('flag_'))
+        unknown = {name for name in names
+                   if name.startswith('obligation_') and name not in _OBLIGATION_BITS}
+        if unknown:
+            raise ValueError(f"Obligations missing from Obligation: {sorted(unknown)}")
+        flags = sorted(name for name in names if name.startswith('flag_'))
+        offset = len(Obligation.__members__)
+        self._flag_bit = {name: 1 << (offset + i) for i, name in enumerate(flags)}
+        self._flag_bit.update(_OBLIGATION_BITS)
+        self._flag_decode = tuple((name, self._flag_bit[name]) for name in flags)
+        self._terminal_bits = sum(self._flag_bit[flag] for flag in _TERMINAL_FLAGS)
+        self._terminal_decode = tuple((self._flag_bit[flag], result) for flag, result
+                                      in zip(_TERMINAL_FLAGS, _TERMINAL_EXPLANATIONS))
+
+    def _terminal_result(self, flag_mask: int) -> Optional[DecisionResult]:
+        """Terminal result encoded in a flag mask, if any"""
+        if flag_mask & self._terminal_bits:
+            for bit, result in self._terminal_decode:
+                if flag_mask & bit:
+                    return result
+        return None
+
+    def _encode_answer(self, question_id: str, value: Any) -> int:
+        """Pack an (already normalized) answer into answer-mask bits"""
+        if question_id not in self.questions:
+            raise ValueError(f"Unknown question {question_id!r}")
+        values = value if isinstance(value, frozenset) else (value,)
+        bits = 0
+        for v in values:
+            bit = self._answer_bit.get((question_id, v))
+            if bit is None:
+                raise ValueError(f"Unknown option {v!r} for question {question_id}")
+            bits |= bit
+        return bits
+
+    def _mask_condition(self, condition: str, vectorized: bool = False) -> str:
+        """
+        Translate a rule condition into bit tests on the answer mask `a` and flag mask `f`.
+
+        With `vectorized`, `a` and `f` are integer arrays and the result is a
+        boolean array, so and/or become element-wise & and |.
+        """
+        def test(mask_name: str, bits: int) -> str:
+            return f"(({mask_name} & {bits}) != 0)"
+
+        def translate(node) -> str:
+            if isinstance(node, ast.BoolOp):
+                if vectorized:
+                    op = ' & ' if isinstance(node.op, ast.And) else ' | '
+                else:
+                    op = ' and ' if isinstance(node.op, ast.And) else ' or '
+                return '(' + op.join(translate(v) for v in node.values) + ')'
+            if isinstance(node, ast.Name) and node.id in self._flag_bit:
+                return test('f', self._flag_bit[node.id])
+            if isinstance(node, ast.Compare) and len(node.ops) == 1:
+                left, right = node.left, node.comparators[0]
+                # 'value' in Qx
+                if isinstance(node.ops[0], ast.In) and isinstance(right, ast.Name):
+                    return test('a', self._answer_bit[right.id, left.value])
+                # Qx == 'value'
+                if isinstance(node.ops[0], ast.Eq) and isinstance(left, ast.Name):
+                    return test('a', self._answer_bit[left.id, right.value])
+            if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Sub, ast.BitAnd)):
+                # Qx - VALUES (any other option) / Qx & VALUES (any of the options)
+                q_id = node.left.id
+                values = self._rule_namespace[node.right.id]
+                bits = sum(bit for (q, v), bit in self._answer_bit.items()
+                           if q == q_id and v in values)
+                if isinstance(node.op, ast.Sub):
+                    bits = self._question_answer_bits[q_id] & ~bits
+                return test('a', bits)
+            raise ValueError(f"Unsupported rule condition: {condition!r}")
+
+        return translate(ast.parse(condition, mode='eval').body)
+
+    def _compile_rules(self) -> Callable[[int, int], Tuple[int, int]]:
+        """
+        Generate a single kernel for all inference rules and question gates.
+
+        The emitted function `rules_kernel(a, f)` takes the answer mask and
+        the flag mask and returns the new flag mask together with the gate
+        mask packed from _QUESTION_GATES, so answering a question is one
+        call. Each rule becomes a flat `if` over bit tests that ORs its
+        effects into `f`. Rules that set a terminal flag run first as an
+        `if`/`elif` chain: once one fires no other derivation matters, so
+        the rest are skipped; they may only depend on answers. The remaining
+        rules run once, in the dependency order established by _sort_rules.
+        When numba is installed the kernel is compiled to native code.
+        """
+        terminal = [rule for rule in self.inference_rules if self._is_terminal_rule(rule[2])]
+        others = [rule for rule in self.inference_rules if not self._is_terminal_rule(rule[2])]
+
+        lines = ['def rules_kernel(a, f):']
+        keyword = 'if'
+        for name, condition, effects in terminal:
+            self._check_terminal_rule(name, condition)
+            lines.append(f"    # {name}")
+            lines.append(f"    {keyword} {self._mask_condition(condition)}:")
+            lines.append(f"        f |= {self._effect_bits(name, effects)}")
+            keyword = 'elif'
+
+        indent = '    '
+        if terminal and others:
+            lines.append("    else:")
+            indent = '        '
+        for name, condition, effects in others:
+            lines.append(f"{indent}# {name}")
+            lines.append(f"{indent}if {self._mask_condition(condition)}:")
+            lines.append(f"{indent}    f |= {self._effect_bits(name, effects)}")
+        lines.append(f"    return f, {self._gate_expression()}")
+
+        namespace = {}
+        exec(compile('\n'.join(lines), '<inference rules>', 'exec'), namespace)
+        kernel = namespace['rules_kernel']
+        if _HAS_NUMBA:
+            # Generated source has no file to cache against, so compile eagerly
+            kernel = numba.njit('UniTuple(int64, 2)(int64, int64)')(kernel)
+        return kernel
+
+    def _effect_bits(self, name: str, effects: Dict[str, Any]) -> int:
+        """Pack a rule's effects into flag-mask bits"""
+        bits = 0
+        for key, value in effects.items():
+            if key.startswith('flag_') and value is not True:
+                raise ValueError(f"Rule {name} must only set flags to True")
+            if value:
+                bits |= self._flag_bit[key]
+        return bits
+
+    @staticmethod
+    def _is_terminal_rule(effects: Dict[str, Any]) -> bool:
+        return any(key in _TERMINAL_FLAGS for key in effects)
+
+    @staticmethod
+    def _check_terminal_rule(name: str, condition: str):
+        """Terminal rules are evaluated before any flag is derived"""
+        if any(n.startswith('flag_') for n in compile(condition, '<rule>', 'eval').co_names):
+            raise ValueError(f"Terminal rule {name} must only depend on answers")
+
+    def _compile_batch_rules(self) -> Callable:
+        """
+        Generate the NumPy counterpart of rules_kernel.
+
+        `batch_kernel(a, f)` takes int64 arrays of answer and flag masks, one
+        entry per assessment, and returns the new flag masks. Rows where a
+        terminal rule fires are frozen, mirroring the early return in
+        rules_kernel.
+        """
+        lines = ['def batch_kernel(a, f):',
+                 '    f = f.copy()',
+                 '    done = np.zeros(f.shape, dtype=bool)']
+        for name, condition, effects in self.inference_rules:
+            if self._is_terminal_rule(effects):
+                lines.append(f"    # {name}")
+                lines.append(f"    hit = ~done & {self._mask_condition(condition, vectorized=True)}")
+                lines.append(f"    f[hit] |= {self._effect_bits(name, effects)}")
+                lines.append("    done |= hit")
+
+        for name, condition, effects in self.inference_rules:
+            if self._is_terminal_rule(effects):
+                continue
+            lines.append(f"    # {name}")
+            lines.append(f"    f[~done & {self._mask_condition(condition, vectorized=True)}]"
+                         f" |= {self._effect_bits(name, effects)}")
+        lines.append("    return f")
+
+        namespace = {'np': np}
+        exec(compile('\n'.join(lines), '<batch inference rules>', 'exec'), namespace)
+        return namespace['batch_kernel']
+
+    def _gate_expression(self) -> str:
+        """Expression packing _QUESTION_GATES into a bitmask, over `a` and `f`"""
+        terms = " |\n            ".join(
+            f"({1 << i} if {self._mask_condition(gate)} else 0)"
+            for i, gate in enumerate(self._QUESTION_GATES))
+        return f"({terms})"
     
     def get_next_question(self) -> Optional[Question]:
         """Get next question based on current state and optimization"""
-        # Check for terminal states
-        if self.current_state.get_flag('flag_out_of_scope'):
-            return None
-        if self.current_state.get_flag('flag_excluded'):
+        if self._terminal is not None:
             return None
-        if self.current_state.get_flag('flag_prohibited'):
+
+        # The next question is a pure function of (answered, gates); each
+        # reachable key is scanned once and then served from the table.
+        key = self._answered_mask | (self._gate_mask << len(self.questions))
+        if key not in self._next_q_table:
+            self._next_q_table[key] = self._scan_next_question()
+        index = self._next_q_table[key]
+        return self._q_obj[index] if index is not None else None
+
+    def _scan_next_question(self) -> Optional[int]:
+        """Find the index of the next question by scanning the question order"""
+        if self._terminal is not None:
             return None
         
         # Determine next question based on path
-        question_order = ['Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q5A', 'Q6', 'Q6A', 'Q6B', 'Q7', 'Q8', 'Q9']
-        
-        for q_id in question_order:
+        state = self.current_state
+        answered = self._answered_mask
+        q6 = state.get_answer('Q6') or _EMPTY
+        for i in range(len(self._q_ids)):
             # Skip if already answered
-            if self.current_state.get_answer(q_id) is not None:
+            if answered & self._q_bits[i]:
                 continue
             
-            question = self.questions[q_id]
-            
             # Check skip conditions
-            skippable, reason = question.is_skippable(self.current_state)
+            skippable, reason = self._q_skip_fn[i](state)
             if skippable:
                 continue
             
             # Additional logic for conditional questions
-            if q_id == 'Q5A' and self.current_state.get_answer('Q5') != 'yes_gpai':
+            extra_skip = self._q_extra_skip[i]
+            if extra_skip is not None and extra_skip(state, q6):
                 continue
-
-            if q_id == 'Q6A':
-                q6_answer = self.current_state.get_answer('Q6')
-                # Q6A is only for Annex I (section A or B) - products requiring conformity assessment
-                if not self._answer_contains(q6_answer, 'annex_i_section_a') and \
-                   not self._answer_contains(q6_answer, 'annex_i_section_b'):
-                    continue
-
-            if q_id == 'Q6B':
-                q6_answer = self.current_state.get_answer('Q6')
-                # Q6B is for Annex III use cases (skip if none selected or only Annex I with Q6A already answered)
-                if not q6_answer:
-                    continue
-                # Skip if answer is just 'none' or ['none']
-                if not self._has_non_none_answer(q6_answer):
-                    continue
-                # Also skip if only Annex I was selected and Q6A is already answered
-                q6a_answer = self.current_state.get_answer('Q6A')
-                if q6a_answer is not None:
-                    # Check if there are any Annex III selections
-                    has_annex_iii = any(
-                        self._answer_contains(q6_answer, f'annex_iii_{cat}')
-                        for cat in ['biometrics', 'critical_infra', 'education', 'employment',
-                                   'essential_services', 'law_enforcement', 'migration', 'justice']
-                    )
-                    if not has_annex_iii:
-                        continue
-
-            if q_id == 'Q8':
-                # Skip Q8 if already a provider (original provider doesn't need modification check)
-                if self.current_state.get_flag('flag_is_provider') and \
-                   not self.current_state.get_flag('flag_is_product_manufacturer'):
-                    continue
-
-            if q_id == 'Q9':
-                if not (self.current_state.get_flag('flag_high_risk') and
-                       self.current_state.get_flag('flag_is_deployer')):
-                    continue
             
-            return question
+            return i
         
         return None
     
     def answer_question(self, question_id: str, answer_value: Any):
-        """Process answer and update state"""
-        answer = Answer(question_id, answer_value)
+        """Process answer and update state
+
+        Raises ValueError, leaving the engine unchanged, if question_id is
+        not a known question, the answer is not one of its options (this
+        includes a list given to a single-choice question) or the question
+        was already answered; answers cannot be changed, call reset() to
+        start over.
+        """
+        answer = Answer(question_id, self._normalize_answer(question_id, answer_value))
+        # Encode before any update, so a rejected answer changes nothing
+        answer_bits = self._encode_answer(question_id, answer.value)
+        if self._answered_mask & self._question_bits.get(question_id, 0):
+            raise ValueError(f"Question {question_id} was already answered")
         self.current_state = self.current_state.with_answer(answer)
         self.path.append(question_id)
+        self._answered_mask |= self._question_bits.get(question_id, 0)
+
+        # The assessment is already over; no further derivations are needed
+        if self._terminal is not None:
+            return
         
-        # Apply inference rules
-        self.current_state = self.optimizer.apply_inference_rules(self.current_state)
+        # Apply inference rules on the packed masks; the state's flags and
+        # obligations are only rebuilt when the kernel derived something new
+        self._answer_mask |= answer_bits
+        flag_mask, self._gate_mask = self._rules_kernel(self._answer_mask, self._flag_mask)
+        if flag_mask != self._flag_mask:
+            self._flag_mask = flag_mask
+            if self._gate_mask & _TERMINAL_GATE:
+                self._terminal = self._terminal_result(flag_mask)
+            self.current_state = self.current_state.with_derived(
+                flags=tuple((name, True) for name, bit in self._flag_decode if flag_mask & bit),
+                obligations=tuple(name for name, bit in _OBLIGATION_DECODE if flag_mask & bit)
+            )
     
+    @property
+    def obligation_mask(self) -> Obligation:
+        """Obligations derived so far, as an Obligation bitmask"""
+        return Obligation(self._flag_mask & _ALL_OBLIGATIONS)
+
     def get_result(self) -> ComplianceResult:
         """Get final compliance result"""
-        flags = self.current_state.get_flags_dict()
-        obligations = self.current_state.get_obligations_set()
-        
-        # Determine result
-        if flags.get('flag_out_of_scope'):
-            result = DecisionResult.OUT_OF_SCOPE
-            explanation = "System is outside the scope of the EU AI Act"
-        elif flags.get('flag_excluded'):
-            result = DecisionResult.EXCLUDED
-            explanation = "System is excluded from EU AI Act requirements"
-        elif flags.get('flag_prohibited'):
-            result = DecisionResult.PROHIBITED
-            explanation = "System performs prohibited functions and cannot be placed on EU market"
+        return self._make_result(self._terminal,
+                                 self.current_state.get_flags_dict(),
+                                 _decode_obligations(self._flag_mask),
+                                 self.path)
+
+    def _make_result(self, terminal: Optional[DecisionResult], flags: Dict[str, bool],
+                     obligations: Set[str], path: List[str]) -> ComplianceResult:
+        """Build a ComplianceResult from the terminal result (if any) and derivations"""
+        if terminal is not None:
+            result = terminal
+            explanation = _TERMINAL_EXPLANATIONS[terminal]
         else:
             result = DecisionResult.COMPLIANCE_REQUIRED
             explanation = f"System requires compliance with {len(obligations)} obligations"
@@ -493,13 +863,81 @@ class OptimizedDecisionEngine:
         return ComplianceResult(
             result=result,
             flags=flags,
-            obligations=obligations,
-            questions_asked=len(self.path),
-            path_taken=self.path,
+            obligations=frozenset(obligations),
+            questions_asked=len(path),
+            path_taken=tuple(path),
             explanation=explanation
         )
+
+    def encode_answers(self, answers: Dict[str, Any]) -> List[int]:
+        """
+        Encode one assessment's answers as a row for batch_evaluate.
+
+        Columns follow question_order; unanswered questions encode as 0.
+        """
+        return [self._encode_answer(q_id, self._normalize_answer(q_id, answers[q_id]))
+                if q_id in answers else 0
+                for q_id in self.question_order]
+
+    def batch_evaluate(self, answer_matrix: 'np.ndarray') -> List[ComplianceResult]:
+        """
+        Evaluate many assessments at once with NumPy.
+
+        `answer_matrix` is an int array of shape (n_systems, n_questions)
+        with rows built by encode_answers. Answers are applied column by
+        column in question order, as an interactive session would, so each
+        row ends up with the same flags and obligations as answering its
+        questions one by one; answers after a terminal result are recorded
+        in the path but derive nothing.
+
+        Requires numpy, which is an optional dependency not declared by
+        this project; raises ImportError when it is not installed.
+        """
+        if not _HAS_NUMPY:
+            raise ImportError("batch_evaluate requires numpy")
+        if self._batch_kernel is None:
+            self._batch_kernel = self._compile_batch_rules()
+
+        answers = np.asarray(answer_matrix, dtype=np.int64)
+        a = np.zeros(len(answers), dtype=np.int64)
+        f = np.zeros(len(answers), dtype=np.int64)
+        for column in answers.T:
+            # Only rows that answered this question and are not yet terminal
+            live = (column != 0) & ((f & self._terminal_bits) == 0)
+            a |= column
+            f = np.where(live, self._batch_kernel(a, f), f)
+
+        results = []
+        for row, flag_mask in zip(answers, f.tolist()):
+            results.append(self._make_result(
+                self._terminal_result(flag_mask),
+                {name: True for name, bit in self._flag_decode if flag_mask & bit},
+                _decode_obligations(flag_mask),
+                [q_id for q_id, value in zip(self.question_order, row) if value]))
+        return results
     
     def reset(self):
         """Reset engine for new assessment"""
         self.current_state = State()
-        self.path = []
\ No newline at end of file
+        self.path = []
+        self._answered_mask = 0
+        self._answer_mask = 0
+        self._flag_mask = 0
+        self._gate_mask = 0
+        self._terminal = None
+
+    def checkpoint(self) -> tuple:
+        """
+        Snapshot the assessment so far, for a later restore().
+
+        The State is immutable, so a snapshot only holds references, the
+        packed masks and a copy of the path (one entry per answered question).
+        """
+        return (self.current_state, tuple(self.path), self._answered_mask,
+                self._answer_mask, self._flag_mask, self._gate_mask, self._terminal)
+
+    def restore(self, checkpoint: tuple):
+        """Return the assessment to a snapshot taken by checkpoint()"""
+        (self.current_state, path, self._answered_mask, self._answer_mask,
+         self._flag_mask, self._gate_mask, self._terminal) = checkpoint
+        self.path = list(path)
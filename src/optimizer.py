@@ -1,10 +1,93 @@
 # optimizer.py - Decision Tree Optimizer
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Tuple, Optional, Any
+from typing import Dict, List, Set, Tuple, Optional, Any, Callable
 from enum import Enum
 import math
-from collections import defaultdict
+import sys
+from collections import defaultdict, OrderedDict
+from functools import cached_property
+
+try:
+    import numpy as np
+    from _entropy_numba import entropy_from_counts
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+try:
+    from pyrsistent import pmap
+    _HAS_PYRSISTENT = True
+except ImportError:
+    _HAS_PYRSISTENT = False
+
+# 1 / ln(2)
+_INV_LN2 = 1.4426950408889634
+
+def _entropy(counts, total: float) -> float:
+    """Shannon entropy H = -Σ (c/total) × log₂(c/total) over counts (or probabilities, total=1)"""
+    if _HAS_NUMPY:
+        return entropy_from_counts(np.asarray(counts, dtype=np.float64), float(total))
+    entropy = 0.0
+    for count in counts:
+        if count > 0:
+            prob = count / total
+            entropy -= prob * math.log(prob)
+    # log₂(p) = ln(p) / ln(2), factored out of the sum
+    return entropy * _INV_LN2
+
+def _map_with(mapping, key, value):
+    """Return a copy of an answer map with one more entry"""
+    if _HAS_PYRSISTENT:
+        # Persistent map: O(log n), shares structure with the original
+        return mapping.set(key, value)
+    return {**mapping, key: value}
+
+# Canonical flag/obligation tuples, so equal tuples built by different
+# states share one object (and its strings). Bounded by the number of
+# distinct flag combinations; stops growing past the limit.
+_TUPLE_POOL: Dict[tuple, tuple] = {}
+_TUPLE_POOL_LIMIT = 1 << 16
+
+def _canonical(values: tuple) -> tuple:
+    """Return the pooled tuple equal to values"""
+    pooled = _TUPLE_POOL.get(values)
+    if pooled is None:
+        if len(_TUPLE_POOL) >= _TUPLE_POOL_LIMIT:
+            return values
+        pooled = _TUPLE_POOL[values] = values
+    return pooled
+
+def _flag_tuple(flags: Dict[str, bool]) -> Tuple[Tuple[str, bool], ...]:
+    """Sorted, interned and pooled flag tuple for a flags dict"""
+    return _canonical(tuple(sorted((sys.intern(k), v) for k, v in flags.items())))
+
+def _obligation_tuple(obligations: Set[str]) -> Tuple[str, ...]:
+    """Sorted, interned and pooled obligation tuple for an obligations set"""
+    return _canonical(tuple(sorted(sys.intern(o) for o in obligations)))
+
+class FlagRegistry:
+    """Assigns each flag/obligation name a bit position, on first use"""
+    
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+    
+    def bit(self, name: str) -> int:
+        """Bit for a name, assigning the next free one if it is new"""
+        bit = self._bits.get(name)
+        if bit is None:
+            bit = self._bits[sys.intern(name)] = 1 << len(self._bits)
+        return bit
+    
+    def mask(self, names) -> int:
+        """Mask with the bits of all the given names set"""
+        mask = 0
+        for name in names:
+            mask |= self.bit(name)
+        return mask
+
+# Process-wide registry, so masks from different states are comparable
+FLAG_REGISTRY = FlagRegistry()
 
 class QuestionType(Enum):
     SINGLE_CHOICE = "single_choice"
@@ -16,10 +99,23 @@ class Answer:
     question_id: str
     value: Any
     
-    def __hash__(self):
+    def __post_init__(self):
+        # Multiple-choice lists are stored as sorted tuples, so equal
+        # selections compare and hash equal without re-sorting
         if isinstance(self.value, list):
-            return hash((self.question_id, tuple(sorted(self.value))))
+            object.__setattr__(self, 'value', tuple(sorted(self.value)))
+    
+    def __hash__(self):
+        return self._hash
+    
+    @cached_property
+    def _hash(self) -> int:
+        """Hash computed on first use and kept with the (immutable) answer"""
         return hash((self.question_id, self.value))
+    
+    def __getstate__(self):
+        # String hashes differ between processes; don't pickle the cached hash
+        return {'question_id': self.question_id, 'value': self.value}
 
 @dataclass(frozen=True)
 class State:
@@ -29,54 +125,116 @@ class State:
     obligations: Tuple[str, ...] = field(default_factory=tuple)
     
     def __hash__(self):
+        return self._hash
+    
+    @cached_property
+    def _hash(self) -> int:
+        """Hash computed on first use and kept with the (immutable) state"""
         return hash((self.answers, self.flags, self.obligations))
     
+    def __getstate__(self):
+        # Pickle the fields only, not the cached hash and lookup indexes
+        return {'answers': self.answers, 'flags': self.flags, 'obligations': self.obligations}
+    
     def with_answer(self, answer: Answer) -> 'State':
         """Return new state with additional answer"""
-        return State(
+        state = State(
             answers=self.answers + (answer,),
             flags=self.flags,
             obligations=self.obligations
         )
+        # Derive the new state's answer map from ours if it is already built
+        answers = self.__dict__.get('_answers_cache')
+        if answers is not None:
+            if answer.question_id not in answers:
+                answers = _map_with(answers, answer.question_id, answer.value)
+            state.__dict__['_answers_cache'] = answers
+        return state
     
     def with_flags(self, new_flags: Dict[str, bool]) -> 'State':
         """Return new state with updated flags"""
-        flag_tuples = tuple(sorted(new_flags.items()))
-        return State(
-            answers=self.answers,
-            flags=flag_tuples,
-            obligations=self.obligations
-        )
+        return self.with_derived(_flag_tuple(new_flags), self.obligations)
     
     def with_obligations(self, new_obligations: Set[str]) -> 'State':
         """Return new state with updated obligations"""
+        return self.with_derived(self.flags, _obligation_tuple(new_obligations))
+    
+    def with_derived(self, flags: Tuple[Tuple[str, bool], ...],
+                     obligations: Tuple[str, ...]) -> 'State':
+        """Return new state with the same answers and the given flag/obligation tuples"""
+        flags = _canonical(flags)
+        obligations = _canonical(obligations)
+        # Nothing changed: states are immutable, so reuse this one
+        if flags == self.flags and obligations == self.obligations:
+            return self
+        state = State(answers=self.answers, flags=flags, obligations=obligations)
+        # Same answers, so the answer map can be shared as is
+        answers = self.__dict__.get('_answers_cache')
+        if answers is not None:
+            state.__dict__['_answers_cache'] = answers
+        return state
+    
+    def to_mutable(self) -> Dict[str, Any]:
+        """Return a mutable working copy (answers tuple, flags dict, obligations set)"""
+        # Built straight from the tuples: the caches would only be copied
+        return {
+            'answers': self.answers,
+            'flags': dict(self.flags),
+            'obligations': set(self.obligations)
+        }
+    
+    @staticmethod
+    def from_mutable(working: Dict[str, Any]) -> 'State':
+        """Freeze a working copy produced by to_mutable back into a State"""
         return State(
-            answers=self.answers,
-            flags=self.flags,
-            obligations=tuple(sorted(new_obligations))
+            answers=working['answers'],
+            flags=_flag_tuple(working['flags']),
+            obligations=_obligation_tuple(working['obligations'])
         )
     
     def get_answer(self, question_id: str) -> Optional[Any]:
         """Get answer for specific question"""
+        return self._answers_cache.get(question_id)
+    
+    @cached_property
+    def _answers_cache(self):
+        """Answers by question id (the first answer wins), built once per state"""
+        answers = {}
         for answer in self.answers:
-            if answer.question_id == question_id:
-                return answer.value
-        return None
+            answers.setdefault(answer.question_id, answer.value)
+        return pmap(answers) if _HAS_PYRSISTENT else answers
+    
+    @cached_property
+    def _flags_cache(self) -> Dict[str, bool]:
+        """Flags as a dictionary, built once per state"""
+        return dict(self.flags)
+    
+    @cached_property
+    def flags_mask(self) -> int:
+        """Set (truthy) flags as a FLAG_REGISTRY bitmask"""
+        return FLAG_REGISTRY.mask(name for name, value in self.flags if value)
+    
+    @cached_property
+    def obligations_mask(self) -> int:
+        """Obligations as a FLAG_REGISTRY bitmask"""
+        return FLAG_REGISTRY.mask(self.obligations)
+    
+    @cached_property
+    def _obligations_cache(self) -> frozenset:
+        """Obligations as a set, built once per state"""
+        return frozenset(self.obligations)
     
     def get_flag(self, flag_name: str) -> bool:
         """Get flag value"""
-        for name, value in self.flags:
-            if name == flag_name:
-                return value
-        return False
+        return self._flags_cache.get(flag_name, False)
     
     def get_flags_dict(self) -> Dict[str, bool]:
-        """Convert flags to dictionary"""
-        return dict(self.flags)
+        """Convert flags to dictionary (a fresh copy the caller may modify)"""
+        return self._flags_cache.copy()
     
     def get_obligations_set(self) -> Set[str]:
-        """Convert obligations to set"""
-        return set(self.obligations)
+        """Convert obligations to set (a fresh copy the caller may modify)"""
+        return set(self._obligations_cache)
 
 @dataclass
 class Question:
@@ -89,42 +247,126 @@ class Question:
     information_gain: float = 0.0
     skip_conditions: List[str] = field(default_factory=list)
     terminal_probability: float = 0.0
+    # skip_conditions parsed once to (condition, flag bit, expected value);
+    # conditions in any other format never match and are dropped
+    _compiled_skip: Tuple[Tuple[str, int, bool], ...] = field(
+        default=(), init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        compiled = (self._compile_skip(condition) for condition in self.skip_conditions)
+        self._compiled_skip = tuple(c for c in compiled if c is not None)
     
     def is_skippable(self, state: State) -> Tuple[bool, Optional[str]]:
         """Check if question should be skipped given current state"""
-        for condition in self.skip_conditions:
-            if self._evaluate_condition(condition, state):
+        mask = state.flags_mask
+        for condition, bit, expected in self._compiled_skip:
+            if ((mask & bit) != 0) == expected:
                 return True, condition
         return False, None
     
-    def _evaluate_condition(self, condition: str, state: State) -> bool:
-        """Evaluate skip condition"""
+    @staticmethod
+    def _compile_skip(condition: str) -> Optional[Tuple[str, int, bool]]:
+        """Parse a skip condition into (condition, flag bit, expected value)"""
         # Simple condition evaluation
         # Format: "flag_name == True" or "flag_name == False"
-        parts = condition.split("==")
-        if len(parts) == 2:
-            flag_name = parts[0].strip()
-            expected = parts[1].strip() == "True"
-            return state.get_flag(flag_name) == expected
-        return False
+        flag_name, sep, value = condition.partition("==")
+        if not sep or "==" in value:
+            return None
+        return condition, FLAG_REGISTRY.bit(flag_name.strip()), value.strip() == "True"
 
 class DecisionTreeOptimizer:
     """Optimizes decision tree for minimum expected path length"""
     
+    # Maximum number of cached information-gain values
+    IG_CACHE_SIZE = 100_000
+    # Maximum number of state spaces whose entropy is cached (each entry
+    # keeps its list alive)
+    ENTROPY_CACHE_SIZE = 1024
+    
     def __init__(self):
         self.questions: Dict[str, Question] = {}
         self.inference_rules: List[Tuple[str, callable, Dict]] = []
         self.state_probabilities: Dict[State, float] = {}
-        self.ig_cache: Dict[Tuple[str, int], float] = {}
+        # LRU cache keyed on (question id, state, state space token)
+        self.ig_cache: 'OrderedDict[Tuple[str, State, int], float]' = OrderedDict()
+        # LRU entropy per state space: id → (state space, its length,
+        # entropy, token). Holding the list keeps its id from being reused
+        # while cached; the token is new each time a list is (re)cached, so
+        # IG entries for an evicted or resized list are never hit again.
+        self._entropy_cache: 'OrderedDict[int, Tuple[List[State], int, float, int]]' = OrderedDict()
+        self._next_space_token = 0
+        # Generated evaluator for the declarative rules; rebuilt lazily
+        # after rules are added
+        self._declarative_kernel: Optional[Callable[[int], int]] = None
+        # Flags/obligations each rule's condition reads (None: unknown)
+        self._rule_reads: List[Optional[Set[str]]] = []
         
     def add_question(self, question: Question):
         """Add question to optimizer"""
         self.questions[question.id] = question
     
-    def add_inference_rule(self, name: str, condition: callable, 
-                          effects: Dict[str, Any]):
-        """Add inference rule for deriving flags/obligations"""
+    def add_inference_rule(self, name: str, condition: Any, 
+                          effects: Dict[str, Any],
+                          reads: Optional[Set[str]] = None):
+        """
+        Add inference rule for deriving flags/obligations
+        
+        The condition is either a State predicate or a declarative dict of
+        required flag values (e.g. {'flag_high_risk': True}), which is
+        evaluated as a bitmask test by a generated function. `reads` names
+        the flags/obligations a predicate depends on; a predicate without
+        it is re-checked after every change.
+        """
         self.inference_rules.append((name, condition, effects))
+        self._rule_reads.append(set(condition) if not callable(condition) else reads)
+        self._declarative_kernel = None
+    
+    def _compile_declarative_rules(self):
+        """
+        Generate one function evaluating every declarative rule condition.
+        
+        Conditions test FLAG_REGISTRY bits of the set flags; the emitted
+        `declarative_kernel(mask)` returns a mask with bit i set for each
+        declarative rule i whose condition holds.
+        """
+        rule_bits = []
+        lines = ['def declarative_kernel(mask):', '    fired = 0']
+        for name, condition, _ in self.inference_rules:
+            if callable(condition):
+                rule_bits.append(0)
+                continue
+            required = forbidden = 0
+            for flag_name, value in condition.items():
+                bit = FLAG_REGISTRY.bit(flag_name)
+                if value:
+                    required |= bit
+                else:
+                    forbidden |= bit
+            rule_bit = 1 << sum(1 for b in rule_bits if b)
+            rule_bits.append(rule_bit)
+            lines.append(f"    # {name}")
+            lines.append(f"    if (mask & {required | forbidden}) == {required}:")
+            lines.append(f"        fired |= {rule_bit}")
+        lines.append("    return fired")
+        
+        namespace = {}
+        exec(compile('\n'.join(lines), '<declarative rules>', 'exec'), namespace)
+        self._declarative_bits = tuple(rule_bits)
+        self._declarative_kernel = namespace['declarative_kernel']
+        
+        # Rules to re-check when a key changes: those reading it, and those
+        # writing it (so a rule whose effect was overwritten reasserts it)
+        self._dependents: Dict[str, Set[int]] = defaultdict(set)
+        self._unknown_reads: Set[int] = set()
+        for index, ((_, _, effects), reads) in enumerate(zip(self.inference_rules,
+                                                            self._rule_reads)):
+            if reads is None:
+                self._unknown_reads.add(index)
+            else:
+                for key in reads:
+                    self._dependents[key].add(index)
+            for key in effects:
+                self._dependents[key].add(index)
     
     def calculate_information_gain(self, question: Question, 
                                    state: State, 
@@ -133,13 +375,18 @@ class DecisionTreeOptimizer:
         Calculate information gain for asking question in current state
         
         IG(Q, S) = H(S) - Σ p(v) × H(S|Q=v)
+        
+        Results are cached per state_space list, which must not be mutated
+        in place while cached; call clear_caches() after changing one.
         """
-        cache_key = (question.id, hash(state))
-        if cache_key in self.ig_cache:
-            return self.ig_cache[cache_key]
+        # Calculate current entropy (cached, with the state space's token)
+        current_entropy, token = self._state_space_entropy(state_space)
         
-        # Calculate current entropy
-        current_entropy = self._calculate_entropy(state_space)
+        cache_key = (question.id, state, token)
+        ig = self.ig_cache.get(cache_key)
+        if ig is not None:
+            self.ig_cache.move_to_end(cache_key)
+            return ig
         
         # Calculate conditional entropy for each possible answer
         conditional_entropy = 0.0
@@ -154,8 +401,37 @@ class DecisionTreeOptimizer:
         
         ig = current_entropy - conditional_entropy
         self.ig_cache[cache_key] = ig
+        if len(self.ig_cache) > self.IG_CACHE_SIZE:
+            self.ig_cache.popitem(last=False)
         return ig
     
+    def _state_space_entropy(self, state_space: List[State]) -> Tuple[float, int]:
+        """Entropy of a state space, computed once per list, and the list's cache token
+
+        A list that was appended to or shortened since is recomputed, but
+        one changed in place at the same length is not: state spaces must
+        not be mutated while cached (see clear_caches).
+        """
+        cache = self._entropy_cache
+        key = id(state_space)
+        cached = cache.get(key)
+        if cached is not None and cached[0] is state_space and cached[1] == len(state_space):
+            cache.move_to_end(key)
+            return cached[2], cached[3]
+        entropy = self._calculate_entropy(state_space)
+        token = self._next_space_token
+        self._next_space_token += 1
+        cache[key] = (state_space, len(state_space), entropy, token)
+        cache.move_to_end(key)
+        if len(cache) > self.ENTROPY_CACHE_SIZE:
+            cache.popitem(last=False)
+        return entropy, token
+    
+    def clear_caches(self):
+        """Drop cached entropies and information gains, e.g. after mutating a state space"""
+        self._entropy_cache.clear()
+        self.ig_cache.clear()
+    
     def _calculate_entropy(self, state_space: List[State]) -> float:
         """
         Calculate Shannon entropy of state space
@@ -164,33 +440,37 @@ class DecisionTreeOptimizer:
         if not state_space:
             return 0.0
         
-        # Count distinct terminal states
-        terminal_counts = defaultdict(int)
-        for state in state_space:
-            # Hash by flags and obligations (terminal classification)
-            key = (state.flags, state.obligations)
-            terminal_counts[key] += 1
-        
-        total = len(state_space)
-        entropy = 0.0
-        for count in terminal_counts.values():
-            if count > 0:
-                prob = count / total
-                entropy -= prob * math.log2(prob)
+        # Number the distinct terminal states (by set flags and
+        # obligations) and count each
+        keys = {}
+        labels = [keys.setdefault((state.flags_mask, state.obligations_mask), len(keys))
+                  for state in state_space]
         
-        return entropy
+        if _HAS_NUMPY:
+            counts = np.bincount(labels)
+        else:
+            counts = [0] * len(keys)
+            for label in labels:
+                counts[label] += 1
+        return _entropy(counts, len(state_space))
     
     def _partition_by_answer(self, question: Question, state: State,
                             state_space: List[State]) -> Dict[Any, List[State]]:
-        """Partition state space by possible answers to question"""
+        """
+        Partition state space by the answer each state holds for question
+        
+        Every state lands in exactly one partition, so the partition sizes
+        sum to len(state_space). States that have not answered the question
+        are kept together under None.
+        """
         partitions = defaultdict(list)
         
         for s in state_space:
-            # Simulate answering question in this state
-            # For now, assume uniform distribution over options
-            for option in question.options:
-                answer_value = option['value']
-                partitions[answer_value].append(s)
+            answer_value = s.get_answer(question.id)
+            if isinstance(answer_value, (tuple, set)):
+                # Multiple-choice answers: key by the (hashable) set of options
+                answer_value = frozenset(answer_value)
+            partitions[answer_value].append(s)
         
         return partitions
     
@@ -202,38 +482,27 @@ class DecisionTreeOptimizer:
         At each step, select question with maximum:
         score(q) = IG(q) × (1 + α × p_terminal(q))
         """
-        ordered = []
-        remaining = questions.copy()
+        self.clear_caches()
         current_state = initial_state
         alpha = 0.5  # Weight for terminal probability
         
-        while remaining:
-            # Calculate scores for all remaining questions
-            scores = []
-            for q in remaining:
-                # Skip if question has skip condition met
-                skippable, _ = q.is_skippable(current_state)
-                if skippable:
-                    continue
-                
-                # Calculate score
-                ig = q.information_gain  # Pre-calculated or use calculate_information_gain
-                score = ig * (1 + alpha * q.terminal_probability)
-                scores.append((score, q))
-            
-            if not scores:
-                break
-            
-            # Select question with highest score
-            scores.sort(reverse=True, key=lambda x: x[0])
-            best_question = scores[0][1]
-            ordered.append(best_question)
-            remaining.remove(best_question)
+        # Scores and skip conditions only depend on the (fixed) current
+        # state, so the greedy selection is a single stable sort. The state
+        # is not advanced between picks; in practice this would need more
+        # sophisticated simulation of the answers.
+        scored = []
+        for q in questions:
+            # Skip if question has skip condition met
+            skippable, _ = q.is_skippable(current_state)
+            if skippable:
+                continue
             
-            # Update state (simulate average answer)
-            # In practice, this would need more sophisticated simulation
+            # Calculate score
+            ig = q.information_gain  # Pre-calculated or use calculate_information_gain
+            scored.append((ig * (1 + alpha * q.terminal_probability), q))
         
-        return ordered
+        scored.sort(reverse=True, key=lambda x: x[0])
+        return [q for _, q in scored]
     
     def calculate_expected_path_length(self, root: Question,
                                       decision_tree: Dict) -> float:
@@ -241,55 +510,117 @@ class DecisionTreeOptimizer:
         Calculate expected path length for decision tree
         E[L] = Σᵢ p(pathᵢ) × |pathᵢ|
         """
-        def traverse(node_id: str, probability: float, depth: int) -> float:
-            if node_id == "TERMINAL":
-                return probability * depth
+        # Per node: (expected remaining depth, probability mass reaching a
+        # leaf), so shared subtrees are evaluated once. Leaves are TERMINAL
+        # and unknown nodes; a node without children ends no path.
+        remaining: Dict[str, Tuple[float, float]] = {}
+        in_progress = set()
+        stack = [(root.id, False)]
+        
+        while stack:
+            node_id, expanded = stack.pop()
+            if node_id in remaining:
+                continue
             
-            node = decision_tree.get(node_id)
+            node = decision_tree.get(node_id) if node_id != "TERMINAL" else None
             if not node:
-                return probability * depth
+                remaining[node_id] = (0.0, 1.0)
+                continue
             
-            expected = 0.0
-            for child, child_prob in node.get('children', {}).items():
-                expected += traverse(child, probability * child_prob, depth + 1)
+            children = node.get('children', {})
+            if not expanded:
+                # Evaluate the children first, then come back to this node
+                in_progress.add(node_id)
+                stack.append((node_id, True))
+                for child in children:
+                    if child in in_progress:
+                        raise ValueError(f"Decision tree has a cycle through {child}")
+                    stack.append((child, False))
+                continue
             
-            return expected
+            depth = mass = 0.0
+            for child, child_prob in children.items():
+                child_depth, child_mass = remaining[child]
+                depth += child_prob * (child_depth + child_mass)
+                mass += child_prob * child_mass
+            remaining[node_id] = (depth, mass)
+            in_progress.discard(node_id)
         
-        return traverse(root.id, 1.0, 0)
+        return remaining[root.id][0]
     
     def apply_inference_rules(self, state: State) -> State:
         """Apply all applicable inference rules to derive flags/obligations"""
-        current_state = state
-        changed = True
+        working = state.to_mutable()
+        self.apply_inference_rules_inplace(working)
+        return State.from_mutable(working)
+    
+    def apply_inference_rules_inplace(self, working: Dict[str, Any]):
+        """
+        Apply inference rules to a working copy from State.to_mutable()
+        
+        Effects update the working flags dict and obligations set in place.
+        Rule conditions still take a State; the snapshot they see is only
+        rebuilt after an effect actually changed the working copy, and
+        rebuilt snapshots share the first one's answer index. Declarative
+        conditions are read from one call to the generated kernel, redone
+        only after a flag changed.
+        
+        Each pass walks the rules in order but only re-checks those on the
+        worklist: initially all of them, then the dependents of whatever
+        changed. A pass that changes nothing leaves the worklist empty.
+        """
+        if self._declarative_kernel is None:
+            self._compile_declarative_rules()
+        kernel = self._declarative_kernel
+        dependents = self._dependents
+        unknown_reads = self._unknown_reads
+        
+        flags = working['flags']
+        obligations = working['obligations']
+        snapshot = base = State.from_mutable(working)
+        mask = base.flags_mask
+        fired = None
+        todo = set(range(len(self.inference_rules)))
         
         # Fixed-point iteration
         max_iterations = 10
         iteration = 0
         
-        while changed and iteration < max_iterations:
-            changed = False
+        while todo and iteration < max_iterations:
             iteration += 1
             
-            for rule_name, condition, effects in self.inference_rules:
-                if condition(current_state):
+            for index, ((rule_name, condition, effects), rule_bit) in enumerate(
+                    zip(self.inference_rules, self._declarative_bits)):
+                if index not in todo:
+                    continue
+                todo.discard(index)
+                if rule_bit:
+                    if fired is None:
+                        fired = kernel(mask)
+                    holds = fired & rule_bit
+                else:
+                    if snapshot is None:
+                        snapshot = base.with_derived(_flag_tuple(flags),
+                                                     _obligation_tuple(obligations))
+                    holds = condition(snapshot)
+                if holds:
                     # Apply effects
-                    new_flags = current_state.get_flags_dict()
-                    new_obligations = current_state.get_obligations_set()
-                    
                     for key, value in effects.items():
                         if key.startswith('flag_'):
-                            if new_flags.get(key) != value:
-                                new_flags[key] = value
-                                changed = True
+                            if flags.get(key) != value:
+                                flags[key] = value
+                                todo |= dependents[key]
+                                todo |= unknown_reads
+                                snapshot = None
+                                bit = FLAG_REGISTRY.bit(key)
+                                mask = mask | bit if value else mask & ~bit
+                                fired = None
                         elif key.startswith('obligation_'):
-                            if value and key not in new_obligations:
-                                new_obligations.add(key)
-                                changed = True
-                    
-                    current_state = current_state.with_flags(new_flags)
-                    current_state = current_state.with_obligations(new_obligations)
-        
-        return current_state
+                            if value and key not in obligations:
+                                obligations.add(key)
+                                todo |= dependents[key]
+                                todo |= unknown_reads
+                                snapshot = None
     
     def generate_optimization_report(self, original_tree: Dict,
                                     optimized_tree: Dict) -> Dict[str, Any]:
@@ -330,12 +661,8 @@ class InformationGainCalculator:
     
     @staticmethod
     def calculate_entropy(probabilities: List[float]) -> float:
-        """Calculate Shannon entropy H = -Σ p × log₂(p)"""
-        entropy = 0.0
-        for p in probabilities:
-            if p > 0:
-                entropy -= p * math.log2(p)
-        return entropy
+        """Calculate Shannon entropy H = -Σ p × log₂(p) (a list or NumPy array)"""
+        return _entropy(probabilities, 1.0)
     
     @staticmethod
     def calculate_conditional_entropy(partitions: List[List[float]],
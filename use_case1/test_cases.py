@@ -1,9 +1,10 @@
 # test_cases.py - Comprehensive test cases
 
-from typing import Dict, List, Any
+import sys
+from typing import Dict, List, Tuple, Any
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """Test case definition"""
     name: str
@@ -15,98 +16,87 @@ class TestCase:
     expected_result: str
     category: str
 
-# Test case definitions
-TEST_CASES = [
+# Test case definitions, one row per case with the fields
+#   (name, category, description, answers, expected_questions,
+#    expected_flags, expected_obligations, expected_result)
+# Note category comes second here, unlike in TestCase; _build maps rows
+# to TestCase fields by name.
+_RAW = (
     # ===== EDGE CASES =====
-    TestCase(
-        name="edge_case_1_out_of_scope",
-        description="Out of scope - fastest path (1 question)",
-        answers={'Q1': 'no_eu_connection'},
-        expected_questions=1,
-        expected_flags={'flag_out_of_scope': True},
-        expected_obligations=[],
-        expected_result='OUT_OF_SCOPE',
-        category='edge_cases'
+    (
+        'edge_case_1_out_of_scope',
+        'edge_cases',
+        'Out of scope - fastest path (1 question)',
+        {'Q1': 'no_eu_connection'},
+        1,
+        {'flag_out_of_scope': True},
+        [],
+        'OUT_OF_SCOPE',
     ),
-    
-    TestCase(
-        name="edge_case_2_prohibited_social_scoring",
-        description="Prohibited system - social scoring (4 questions)",
-        answers={
+
+    (
+        'edge_case_2_prohibited_social_scoring',
+        'edge_cases',
+        'Prohibited system - social scoring (4 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
-            'Q4': ['social_scoring_public']
-        },
-        expected_questions=4,
-        expected_flags={
-            'flag_prohibited': True,
-            'flag_is_provider': True
+            'Q4': ['social_scoring_public'],
         },
-        expected_obligations=['obligation_ai_literacy'],
-        expected_result='PROHIBITED',
-        category='edge_cases'
+        4,
+        {'flag_prohibited': True, 'flag_is_provider': True},
+        ['obligation_ai_literacy'],
+        'PROHIBITED',
     ),
-    
-    TestCase(
-        name="edge_case_3_excluded_personal_use",
-        description="Excluded - personal use (3 questions)",
-        answers={
+
+    (
+        'edge_case_3_excluded_personal_use',
+        'edge_cases',
+        'Excluded - personal use (3 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['deployer'],
-            'Q3': ['personal_non_professional']
-        },
-        expected_questions=3,
-        expected_flags={
-            'flag_excluded': True,
-            'flag_is_deployer': True
+            'Q3': ['personal_non_professional'],
         },
-        expected_obligations=['obligation_ai_literacy'],
-        expected_result='EXCLUDED',
-        category='edge_cases'
+        3,
+        {'flag_excluded': True, 'flag_is_deployer': True},
+        ['obligation_ai_literacy'],
+        'EXCLUDED',
     ),
-    
-    TestCase(
-        name="edge_case_4_excluded_research",
-        description="Excluded - research only (3 questions)",
-        answers={
-            'Q1': 'has_eu_connection',
-            'Q2': ['provider'],
-            'Q3': ['research_only']
-        },
-        expected_questions=3,
-        expected_flags={
-            'flag_excluded': True,
-            'flag_is_provider': True
-        },
-        expected_obligations=['obligation_ai_literacy'],
-        expected_result='EXCLUDED',
-        category='edge_cases'
+
+    (
+        'edge_case_4_excluded_research',
+        'edge_cases',
+        'Excluded - research only (3 questions)',
+        {'Q1': 'has_eu_connection', 'Q2': ['provider'], 'Q3': ['research_only']},
+        3,
+        {'flag_excluded': True, 'flag_is_provider': True},
+        ['obligation_ai_literacy'],
+        'EXCLUDED',
     ),
-    
-    TestCase(
-        name="edge_case_5_excluded_open_source",
-        description="Excluded - open source not deployed (3 questions)",
-        answers={
+
+    (
+        'edge_case_5_excluded_open_source',
+        'edge_cases',
+        'Excluded - open source not deployed (3 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
-            'Q3': ['open_source_not_deployed']
+            'Q3': ['open_source_not_deployed'],
         },
-        expected_questions=3,
-        expected_flags={
-            'flag_excluded': True,
-            'flag_is_provider': True
-        },
-        expected_obligations=['obligation_ai_literacy'],
-        expected_result='EXCLUDED',
-        category='edge_cases'
+        3,
+        {'flag_excluded': True, 'flag_is_provider': True},
+        ['obligation_ai_literacy'],
+        'EXCLUDED',
     ),
-    
+
     # ===== COMMON CASES =====
-    TestCase(
-        name="common_case_1_provider_high_risk_employment",
-        description="Provider of high-risk employment AI (8 questions)",
-        answers={
+    (
+        'common_case_1_provider_high_risk_employment',
+        'common_cases',
+        'Provider of high-risk employment AI (8 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
@@ -114,26 +104,23 @@ TEST_CASES = [
             'Q5': 'no_gpai',
             'Q6': ['annex_iii_employment'],
             'Q6B': 'yes_significant',
-            'Q7': ['interact_with_people']
-        },
-        expected_questions=8,
-        expected_flags={
-            'flag_is_provider': True,
-            'flag_high_risk': True
+            'Q7': ['interact_with_people'],
         },
-        expected_obligations=[
+        8,
+        {'flag_is_provider': True, 'flag_high_risk': True},
+        [
             'obligation_ai_literacy',
             'obligation_provider_high_risk',
-            'obligation_transparency_natural_persons'
+            'obligation_transparency_natural_persons',
         ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='common_cases'
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="common_case_2_deployer_non_high_risk_chatbot",
-        description="Deployer of non-high-risk chatbot (8 questions)",
-        answers={
+    (
+        'common_case_2_deployer_non_high_risk_chatbot',
+        'common_cases',
+        'Deployer of non-high-risk chatbot (8 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['deployer'],
             'Q3': ['none'],
@@ -141,25 +128,19 @@ TEST_CASES = [
             'Q5': 'no_gpai',
             'Q6': ['none'],
             'Q7': ['interact_with_people'],
-            'Q8': ['none']
+            'Q8': ['none'],
         },
-        expected_questions=8,
-        expected_flags={
-            'flag_is_deployer': True,
-            'flag_high_risk': False
-        },
-        expected_obligations=[
-            'obligation_ai_literacy',
-            'obligation_transparency_natural_persons'
-        ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='common_cases'
+        8,
+        {'flag_is_deployer': True, 'flag_high_risk': False},
+        ['obligation_ai_literacy', 'obligation_transparency_natural_persons'],
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="common_case_3_gpai_systemic_risk",
-        description="GPAI model with systemic risk (8 questions)",
-        answers={
+    (
+        'common_case_3_gpai_systemic_risk',
+        'common_cases',
+        'GPAI model with systemic risk (8 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
@@ -167,28 +148,24 @@ TEST_CASES = [
             'Q5': 'yes_gpai',
             'Q5A': 'yes_systemic',
             'Q6': ['none'],
-            'Q7': ['generate_synthetic_content']
+            'Q7': ['generate_synthetic_content'],
         },
-        expected_questions=8,
-        expected_flags={
-            'flag_is_provider': True,
-            'flag_gpai': True,
-            'flag_gpai_systemic_risk': True
-        },
-        expected_obligations=[
+        8,
+        {'flag_is_provider': True, 'flag_gpai': True, 'flag_gpai_systemic_risk': True},
+        [
             'obligation_ai_literacy',
             'obligation_gpai_base',
             'obligation_gpai_systemic',
-            'obligation_transparency_synthetic_content'
+            'obligation_transparency_synthetic_content',
         ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='common_cases'
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="common_case_4_gpai_no_systemic_risk",
-        description="GPAI model without systemic risk (8 questions)",
-        answers={
+    (
+        'common_case_4_gpai_no_systemic_risk',
+        'common_cases',
+        'GPAI model without systemic risk (8 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
@@ -196,27 +173,20 @@ TEST_CASES = [
             'Q5': 'yes_gpai',
             'Q5A': 'no_systemic',
             'Q6': ['none'],
-            'Q7': ['none']
-        },
-        expected_questions=8,
-        expected_flags={
-            'flag_is_provider': True,
-            'flag_gpai': True,
-            'flag_gpai_systemic_risk': False
+            'Q7': ['none'],
         },
-        expected_obligations=[
-            'obligation_ai_literacy',
-            'obligation_gpai_base'
-        ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='common_cases'
+        8,
+        {'flag_is_provider': True, 'flag_gpai': True, 'flag_gpai_systemic_risk': False},
+        ['obligation_ai_literacy', 'obligation_gpai_base'],
+        'COMPLIANCE_REQUIRED',
     ),
-    
+
     # ===== COMPLEX CASES =====
-    TestCase(
-        name="complex_case_1_product_manufacturer_medical",
-        description="Product manufacturer with high-risk medical device (9 questions)",
-        answers={
+    (
+        'complex_case_1_product_manufacturer_medical',
+        'complex_cases',
+        'Product manufacturer with high-risk medical device (9 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['product_manufacturer'],
             'Q3': ['none'],
@@ -225,26 +195,24 @@ TEST_CASES = [
             'Q6': ['annex_i_section_a'],
             'Q6A': 'yes_required',
             'Q7': ['none'],
-            'Q8': ['none']
+            'Q8': ['none'],
         },
-        expected_questions=9,
-        expected_flags={
+        9,
+        {
             'flag_is_product_manufacturer': True,
             'flag_becomes_provider': True,
             'flag_is_provider': True,
-            'flag_high_risk': True
+            'flag_high_risk': True,
         },
-        expected_obligations=[
-            'obligation_provider_high_risk'
-        ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='complex_cases'
+        ['obligation_provider_high_risk'],
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="complex_case_2_deployer_becomes_provider",
-        description="Deployer modifies system → becomes provider (10 questions)",
-        answers={
+    (
+        'complex_case_2_deployer_becomes_provider',
+        'complex_cases',
+        'Deployer modifies system → becomes provider (10 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['deployer'],
             'Q3': ['none'],
@@ -254,31 +222,31 @@ TEST_CASES = [
             'Q6B': 'yes_significant',
             'Q7': ['emotion_recognition'],
             'Q8': ['substantial_modification'],
-            'Q9': 'yes_public'
+            'Q9': 'yes_public',
         },
-        expected_questions=10,
-        expected_flags={
+        10,
+        {
             'flag_is_deployer': True,
             'flag_becomes_provider': True,
             'flag_is_provider': True,
-            'flag_high_risk': True
+            'flag_high_risk': True,
         },
-        expected_obligations=[
+        [
             'obligation_ai_literacy',
             'obligation_handover',
             'obligation_deployer_high_risk',
             'obligation_provider_high_risk',
             'obligation_transparency_emotion_biometric',
-            'obligation_fundamental_rights_assessment'
+            'obligation_fundamental_rights_assessment',
         ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='complex_cases'
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="complex_case_3_high_risk_law_enforcement",
-        description="High-risk law enforcement system (8 questions)",
-        answers={
+    (
+        'complex_case_3_high_risk_law_enforcement',
+        'complex_cases',
+        'High-risk law enforcement system (8 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
@@ -286,26 +254,20 @@ TEST_CASES = [
             'Q5': 'no_gpai',
             'Q6': ['annex_iii_law_enforcement'],
             'Q6B': 'yes_significant',
-            'Q7': ['none']
-        },
-        expected_questions=8,
-        expected_flags={
-            'flag_is_provider': True,
-            'flag_high_risk': True
+            'Q7': ['none'],
         },
-        expected_obligations=[
-            'obligation_ai_literacy',
-            'obligation_provider_high_risk'
-        ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='complex_cases'
+        8,
+        {'flag_is_provider': True, 'flag_high_risk': True},
+        ['obligation_ai_literacy', 'obligation_provider_high_risk'],
+        'COMPLIANCE_REQUIRED',
     ),
-    
+
     # ===== REGRESSION TESTS =====
-    TestCase(
-        name="regression_1_medical_no_third_party",
-        description="Medical device NOT requiring 3rd party assessment (9 questions)",
-        answers={
+    (
+        'regression_1_medical_no_third_party',
+        'regression_tests',
+        'Medical device NOT requiring 3rd party assessment (9 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
@@ -314,49 +276,42 @@ TEST_CASES = [
             'Q6': ['annex_i_section_a'],
             'Q6A': 'no_or_opt_out',
             'Q6B': 'no_significant',
-            'Q7': ['none']
-        },
-        expected_questions=9,
-        expected_flags={
-            'flag_is_provider': True,
-            'flag_high_risk': False
+            'Q7': ['none'],
         },
-        expected_obligations=[
-            'obligation_ai_literacy'
-        ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='regression_tests'
+        9,
+        {'flag_is_provider': True, 'flag_high_risk': False},
+        ['obligation_ai_literacy'],
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="regression_2_multiple_transparency",
-        description="System with multiple transparency obligations (7 questions)",
-        answers={
+    (
+        'regression_2_multiple_transparency',
+        'regression_tests',
+        'System with multiple transparency obligations (7 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
             'Q4': ['none'],
             'Q5': 'no_gpai',
             'Q6': ['none'],
-            'Q7': ['interact_with_people', 'generate_synthetic_content']
-        },
-        expected_questions=7,
-        expected_flags={
-            'flag_is_provider': True
+            'Q7': ['interact_with_people', 'generate_synthetic_content'],
         },
-        expected_obligations=[
+        7,
+        {'flag_is_provider': True},
+        [
             'obligation_ai_literacy',
             'obligation_transparency_natural_persons',
-            'obligation_transparency_synthetic_content'
+            'obligation_transparency_synthetic_content',
         ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='regression_tests'
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="regression_3_critical_infrastructure",
-        description="High-risk critical infrastructure system (9 questions)",
-        answers={
+    (
+        'regression_3_critical_infrastructure',
+        'regression_tests',
+        'High-risk critical infrastructure system (9 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider', 'deployer'],
             'Q3': ['none'],
@@ -365,84 +320,74 @@ TEST_CASES = [
             'Q6': ['annex_iii_critical_infra'],
             'Q6B': 'yes_significant',
             'Q7': ['none'],
-            'Q9': 'yes_public'
+            'Q9': 'yes_public',
         },
-        expected_questions=9,
-        expected_flags={
-            'flag_is_provider': True,
-            'flag_is_deployer': True,
-            'flag_high_risk': True
-        },
-        expected_obligations=[
+        9,
+        {'flag_is_provider': True, 'flag_is_deployer': True, 'flag_high_risk': True},
+        [
             'obligation_ai_literacy',
             'obligation_provider_high_risk',
             'obligation_deployer_high_risk',
-            'obligation_fundamental_rights_assessment'
+            'obligation_fundamental_rights_assessment',
         ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='regression_tests'
+        'COMPLIANCE_REQUIRED',
     ),
-    
+
     # ===== PROHIBITED FUNCTION TESTS =====
-    TestCase(
-        name="prohibited_1_subliminal_manipulation",
-        description="Prohibited - subliminal manipulation",
-        answers={
+    (
+        'prohibited_1_subliminal_manipulation',
+        'prohibited_tests',
+        'Prohibited - subliminal manipulation',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
-            'Q4': ['subliminal_manipulation']
+            'Q4': ['subliminal_manipulation'],
         },
-        expected_questions=4,
-        expected_flags={
-            'flag_prohibited': True
-        },
-        expected_obligations=['obligation_ai_literacy'],
-        expected_result='PROHIBITED',
-        category='prohibited_tests'
+        4,
+        {'flag_prohibited': True},
+        ['obligation_ai_literacy'],
+        'PROHIBITED',
     ),
-    
-    TestCase(
-        name="prohibited_2_exploit_vulnerabilities",
-        description="Prohibited - exploiting vulnerabilities",
-        answers={
+
+    (
+        'prohibited_2_exploit_vulnerabilities',
+        'prohibited_tests',
+        'Prohibited - exploiting vulnerabilities',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['provider'],
             'Q3': ['none'],
-            'Q4': ['exploit_vulnerabilities']
+            'Q4': ['exploit_vulnerabilities'],
         },
-        expected_questions=4,
-        expected_flags={
-            'flag_prohibited': True
-        },
-        expected_obligations=['obligation_ai_literacy'],
-        expected_result='PROHIBITED',
-        category='prohibited_tests'
+        4,
+        {'flag_prohibited': True},
+        ['obligation_ai_literacy'],
+        'PROHIBITED',
     ),
-    
-    TestCase(
-        name="prohibited_3_realtime_biometric",
-        description="Prohibited - real-time biometric ID",
-        answers={
+
+    (
+        'prohibited_3_realtime_biometric',
+        'prohibited_tests',
+        'Prohibited - real-time biometric ID',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['deployer'],
             'Q3': ['none'],
-            'Q4': ['realtime_remote_biometric_public']
+            'Q4': ['realtime_remote_biometric_public'],
         },
-        expected_questions=4,
-        expected_flags={
-            'flag_prohibited': True
-        },
-        expected_obligations=['obligation_ai_literacy'],
-        expected_result='PROHIBITED',
-        category='prohibited_tests'
+        4,
+        {'flag_prohibited': True},
+        ['obligation_ai_literacy'],
+        'PROHIBITED',
     ),
-    
+
     # ===== TRANSPARENCY OBLIGATION TESTS =====
-    TestCase(
-        name="transparency_1_deepfake",
-        description="Transparency - deepfake content (8 questions)",
-        answers={
+    (
+        'transparency_1_deepfake',
+        'transparency_tests',
+        'Transparency - deepfake content (8 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['deployer'],
             'Q3': ['none'],
@@ -450,24 +395,19 @@ TEST_CASES = [
             'Q5': 'no_gpai',
             'Q6': ['none'],
             'Q7': ['deepfake'],
-            'Q8': ['none']
+            'Q8': ['none'],
         },
-        expected_questions=8,
-        expected_flags={
-            'flag_is_deployer': True
-        },
-        expected_obligations=[
-            'obligation_ai_literacy',
-            'obligation_transparency_content_resemblance'
-        ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='transparency_tests'
+        8,
+        {'flag_is_deployer': True},
+        ['obligation_ai_literacy', 'obligation_transparency_content_resemblance'],
+        'COMPLIANCE_REQUIRED',
     ),
 
-    TestCase(
-        name="transparency_2_emotion_recognition",
-        description="Transparency - emotion recognition (non-high-risk) (8 questions)",
-        answers={
+    (
+        'transparency_2_emotion_recognition',
+        'transparency_tests',
+        'Transparency - emotion recognition (non-high-risk) (8 questions)',
+        {
             'Q1': 'has_eu_connection',
             'Q2': ['deployer'],
             'Q3': ['none'],
@@ -475,25 +415,61 @@ TEST_CASES = [
             'Q5': 'no_gpai',
             'Q6': ['none'],
             'Q7': ['emotion_recognition'],
-            'Q8': ['none']
-        },
-        expected_questions=8,
-        expected_flags={
-            'flag_is_deployer': True
+            'Q8': ['none'],
         },
-        expected_obligations=[
-            'obligation_ai_literacy',
-            'obligation_transparency_emotion_biometric'
-        ],
-        expected_result='COMPLIANCE_REQUIRED',
-        category='transparency_tests'
+        8,
+        {'flag_is_deployer': True},
+        ['obligation_ai_literacy', 'obligation_transparency_emotion_biometric'],
+        'COMPLIANCE_REQUIRED',
+    ),
+)
+
+def _intern_answer(value: Any) -> Any:
+    """Intern an answer's option value(s)"""
+    if isinstance(value, list):
+        return [sys.intern(v) for v in value]
+    return sys.intern(value)
+
+def _build(row: tuple) -> TestCase:
+    """Build the TestCase for a raw row, interning its ids and option values"""
+    (name, category, description, answers, expected_questions,
+     expected_flags, expected_obligations, expected_result) = row
+    return TestCase(
+        name=name,
+        description=description,
+        answers={sys.intern(q_id): _intern_answer(value) for q_id, value in answers.items()},
+        expected_questions=expected_questions,
+        expected_flags={sys.intern(flag): value for flag, value in expected_flags.items()},
+        expected_obligations=[sys.intern(o) for o in expected_obligations],
+        expected_result=sys.intern(expected_result),
+        category=category
     )
-]
+
+# All test cases; more can be appended with TEST_CASES.append(TestCase(...))
+TEST_CASES: List[TestCase] = [_build(row) for row in _RAW]
+
+# Test cases per category, in first-seen category order, with the length
+# of TEST_CASES they were built from; built with TEST_CASES below and
+# rebuilt only after cases are appended
+_BY_CATEGORY: Dict[str, List[TestCase]] = {}
+_BY_CATEGORY_SIZE = -1
+
+def _by_category() -> Dict[str, List[TestCase]]:
+    """Index TEST_CASES by category, reusing the index until the list grows"""
+    global _BY_CATEGORY, _BY_CATEGORY_SIZE
+    if _BY_CATEGORY_SIZE != len(TEST_CASES):
+        index: Dict[str, List[TestCase]] = {}
+        for test_case in TEST_CASES:
+            index.setdefault(test_case.category, []).append(test_case)
+        _BY_CATEGORY, _BY_CATEGORY_SIZE = index, len(TEST_CASES)
+    return _BY_CATEGORY
+
+_by_category()
 
 def get_test_cases_by_category(category: str) -> List[TestCase]:
     """Get test cases for specific category"""
-    return [tc for tc in TEST_CASES if tc.category == category]
+    return list(_by_category().get(category, ()))
 
-def get_all_categories() -> List[str]:
-    """Get list of all test categories"""
-    return list(set(tc.category for tc in TEST_CASES))
\ No newline at end of file
+def get_all_categories() -> Tuple[str, ...]:
+    """Get all test categories, in the order they first appear"""
+    return tuple(_by_category())
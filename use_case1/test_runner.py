@@ -1,13 +1,17 @@
 # test_runner.py - Test execution and reporting
 
+import os
 import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from decision_engine import OptimizedDecisionEngine, DecisionResult
-from test_cases import TEST_CASES, get_test_cases_by_category, get_all_categories, TestCase
+from test_cases import TEST_CASES, TestCase
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TestResult:
     """Individual test result"""
     test_case: TestCase
@@ -20,7 +24,7 @@ class TestResult:
     warnings: List[str] = field(default_factory=list)
     execution_time_ms: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class TestReport:
     """Complete test execution report"""
     timestamp: datetime
@@ -32,104 +36,218 @@ class TestReport:
     optimization_metrics: Dict[str, Any]
     errors_summary: List[str]
 
-class TestRunner:
-    """Execute and report on test cases"""
+# Full-width (100%) path distribution bar, sliced per bucket
+_BAR = "█" * 50
+
+# Engine for worker processes, built on first use; each TestRunner has its own
+_ENGINE = None
+
+def _get_engine() -> OptimizedDecisionEngine:
+    """Return this process's module-level engine"""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = OptimizedDecisionEngine()
+    return _ENGINE
+
+def _init_worker(profile_guided_order: bool = False):
+    """Process pool initializer: build the worker's engine, configured like the runner's"""
+    global _ENGINE
+    _ENGINE = OptimizedDecisionEngine(profile_guided_order=profile_guided_order)
+
+# Question sequence replayed for every test case
+_QUESTION_SEQUENCE = ('Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q5A', 'Q6', 'Q6A', 'Q6B', 'Q7', 'Q8', 'Q9')
+
+# Results that end the questionnaire early
+_EARLY_EXIT = frozenset({DecisionResult.OUT_OF_SCOPE, DecisionResult.EXCLUDED, DecisionResult.PROHIBITED})
+
+# Reported (upper-case) name of each DecisionResult
+_RESULT_NAMES = {member: sys.intern(member.value.upper()) for member in DecisionResult}
+
+# Trie edge for a question the test case does not answer
+_MISSING = object()
+
+def _prefix_key(answers: Dict[str, Any]) -> Tuple[str, ...]:
+    """Sort key placing answer sets with shared prefixes next to each other"""
+    return tuple(repr(answers.get(q_id)) for q_id in _QUESTION_SEQUENCE)
+
+def _outcome(engine: OptimizedDecisionEngine, errors: List[str]) -> Tuple:
+    """Questionnaire outcome from the engine's current result"""
+    result = engine.get_result()
+    return (result.questions_asked, dict(result.flags), frozenset(result.obligations),
+            _RESULT_NAMES[result.result], tuple(errors))
+
+def _evaluate_trie(answer_sets: List[Dict[str, Any]],
+                   engine: OptimizedDecisionEngine = None) -> Tuple[List[Tuple], List[float]]:
+    """Replay many answer sets, answering each shared prefix only once
+
+    The answer sets form a trie with one level per question in
+    _QUESTION_SEQUENCE, branching on the answer given (or its absence).
+    The engine walks it depth-first, checkpointing before each answer and
+    restoring on backtrack; only the checkpoints along the current branch
+    are alive, at most one per question. Returns one outcome per answer
+    set, in order:
+    (questions asked, flags, obligation set, result, errors),
+    and each answer set's execution time in ms: the measured engine time
+    of the steps along its branch, shared prefix steps included.
+    Uses the process's module-level engine unless one is given.
+    """
+    if engine is None:
+        engine = _get_engine()
+    engine.reset()
+    outcomes = [None] * len(answer_sets)
+    times_ms = [0.0] * len(answer_sets)
+    clock = time.perf_counter_ns
     
-    def __init__(self):
-        self.engine = OptimizedDecisionEngine()
-        self.results: List[TestResult] = []
+    def finish(indices: List[int], errors: List[str], elapsed_ns: int):
+        start = clock()
+        outcome = _outcome(engine, errors)
+        execution_time_ms = (elapsed_ns + clock() - start) / 1_000_000
+        for i in indices:
+            outcomes[i] = outcome
+            times_ms[i] = execution_time_ms
     
-    def run_test_case(self, test_case: TestCase) -> TestResult:
-        """Execute single test case"""
-        import time
-        start_time = time.time()
+    def visit(indices: List[int], depth: int, elapsed_ns: int):
+        if depth == len(_QUESTION_SEQUENCE):
+            finish(indices, [], elapsed_ns)
+            return
         
-        # Reset engine
-        self.engine.reset()
+        question_id = _QUESTION_SEQUENCE[depth]
+        # Answer (or _MISSING) -> (answer as given, indices taking it)
+        branches: Dict[Any, Tuple[Any, List[int]]] = {}
+        for i in indices:
+            value = answer_sets[i].get(question_id, _MISSING)
+            key = tuple(value) if isinstance(value, list) else value
+            branch = branches.get(key)
+            if branch is None:
+                branches[key] = (value, [i])
+            else:
+                branch[1].append(i)
         
-        errors = []
-        warnings = []
-        
-        # Execute questionnaire
-        try:
-            for question_id in ['Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q5A', 'Q6', 'Q6A', 'Q6B', 'Q7', 'Q8', 'Q9']:
-                if question_id in test_case.answers:
-                    self.engine.answer_question(question_id, test_case.answers[question_id])
+        for value, branch in branches.values():
+            if value is _MISSING:
+                # Check if question should be asked
+                start = clock()
+                try:
+                    next_q = engine.get_next_question()
+                except Exception as e:
+                    finish(branch, [f"Exception during execution: {str(e)}"],
+                           elapsed_ns + clock() - start)
+                    continue
+                step_ns = elapsed_ns + clock() - start
+                if next_q and next_q.id == question_id:
+                    # Question expected but not answered in test case
+                    finish(branch, [f"Expected answer for {question_id} but none provided"], step_ns)
                 else:
-                    # Check if question should be asked
-                    next_q = self.engine.get_next_question()
-                    if next_q and next_q.id == question_id:
-                        # Question expected but not answered in test case
-                        errors.append(f"Expected answer for {question_id} but none provided")
-                        break
-                
+                    visit(branch, depth + 1, step_ns)
+                continue
+            
+            saved = engine.checkpoint()
+            start = clock()
+            try:
+                engine.answer_question(question_id, value)
                 # Check for early termination
-                result = self.engine.get_result()
-                if result.result in [DecisionResult.OUT_OF_SCOPE, DecisionResult.EXCLUDED, DecisionResult.PROHIBITED]:
-                    break
-        
-        except Exception as e:
-            errors.append(f"Exception during execution: {str(e)}")
-        
-        # Get final result
-        result = self.engine.get_result()
-        
-        # Collect actual values
-        actual_questions = result.questions_asked
-        actual_flags = result.flags
-        actual_obligations = sorted(result.obligations)
-        actual_result = result.result.value.upper()
-        
-        # Validate results
-        passed = True
-        
-        # Check question count
-        if actual_questions != test_case.expected_questions:
-            errors.append(
-                f"Question count mismatch: expected {test_case.expected_questions}, got {actual_questions}"
-            )
-            passed = False
-        
-        # Check flags
-        for flag_name, expected_value in test_case.expected_flags.items():
-            actual_value = actual_flags.get(flag_name, False)
-            if actual_value != expected_value:
-                errors.append(
-                    f"Flag mismatch for {flag_name}: expected {expected_value}, got {actual_value}"
-                )
-                passed = False
-        
-        # Check obligations
-        expected_obligations = sorted(test_case.expected_obligations)
-        if actual_obligations != expected_obligations:
-            missing = set(expected_obligations) - set(actual_obligations)
-            extra = set(actual_obligations) - set(expected_obligations)
-            if missing:
-                errors.append(f"Missing obligations: {missing}")
-            if extra:
-                errors.append(f"Extra obligations: {extra}")
-            passed = False
-        
-        # Check result
-        if actual_result != test_case.expected_result:
+                early_exit = engine.get_result().result in _EARLY_EXIT
+            except Exception as e:
+                finish(branch, [f"Exception during execution: {str(e)}"],
+                       elapsed_ns + clock() - start)
+            else:
+                step_ns = elapsed_ns + clock() - start
+                if early_exit:
+                    finish(branch, [], step_ns)
+                else:
+                    visit(branch, depth + 1, step_ns)
+            engine.restore(saved)
+    
+    if answer_sets:
+        visit(list(range(len(answer_sets))), 0, 0)
+    return outcomes, times_ms
+
+def _check_outcome(test_case: TestCase, outcome: Tuple, execution_time_ms: float) -> TestResult:
+    """Validate a questionnaire outcome against the test case's expectations"""
+    actual_questions, flags, obligations, actual_result, errors = outcome
+    
+    # Copy the shared values so results never share mutable state
+    actual_flags = dict(flags)
+    errors = list(errors)
+    warnings = []
+    
+    # Validate results
+    passed = True
+    
+    # Check question count
+    if actual_questions != test_case.expected_questions:
+        errors.append(
+            f"Question count mismatch: expected {test_case.expected_questions}, got {actual_questions}"
+        )
+        passed = False
+    
+    # Check flags
+    for flag_name, expected_value in test_case.expected_flags.items():
+        actual_value = actual_flags.get(flag_name, False)
+        if actual_value != expected_value:
             errors.append(
-                f"Result mismatch: expected {test_case.expected_result}, got {actual_result}"
+                f"Flag mismatch for {flag_name}: expected {expected_value}, got {actual_value}"
             )
             passed = False
-        
-        execution_time_ms = (time.time() - start_time) * 1000
-        
-        return TestResult(
-            test_case=test_case,
-            passed=passed,
-            actual_questions=actual_questions,
-            actual_flags=actual_flags,
-            actual_obligations=actual_obligations,
-            actual_result=actual_result,
-            errors=errors,
-            warnings=warnings,
-            execution_time_ms=execution_time_ms
+    
+    # Check obligations
+    actual_obligations = set(obligations)
+    expected_obligations = set(test_case.expected_obligations)
+    if actual_obligations != expected_obligations:
+        missing = expected_obligations - actual_obligations
+        extra = actual_obligations - expected_obligations
+        if missing:
+            errors.append(f"Missing obligations: {missing}")
+        if extra:
+            errors.append(f"Extra obligations: {extra}")
+        passed = False
+    
+    # Check result
+    if actual_result != test_case.expected_result:
+        errors.append(
+            f"Result mismatch: expected {test_case.expected_result}, got {actual_result}"
         )
+        passed = False
+    
+    return TestResult(
+        test_case=test_case,
+        passed=passed,
+        actual_questions=actual_questions,
+        actual_flags=actual_flags,
+        actual_obligations=sorted(actual_obligations),
+        actual_result=actual_result,
+        errors=errors,
+        warnings=warnings,
+        execution_time_ms=execution_time_ms
+    )
+
+def _run_shard(test_cases: List[TestCase],
+               engine: OptimizedDecisionEngine = None) -> List[TestResult]:
+    """Execute test cases through one answer trie
+
+    Module-level so worker processes can run it. Each case's time is
+    measured along its own branch of the trie.
+    """
+    if not test_cases:
+        return []
+    outcomes, times_ms = _evaluate_trie([tc.answers for tc in test_cases], engine)
+    return [_check_outcome(tc, outcome, execution_time_ms)
+            for tc, outcome, execution_time_ms in zip(test_cases, outcomes, times_ms)]
+
+class TestRunner:
+    """Execute and report on test cases"""
+    
+    # Fewest cases worth a process pool; below this, starting the workers
+    # and building their engines costs more than evaluating in-process
+    PARALLEL_MIN_CASES = 1000
+    
+    def __init__(self):
+        self.engine = OptimizedDecisionEngine()
+        self.results: List[TestResult] = []
+    
+    def run_test_case(self, test_case: TestCase) -> TestResult:
+        """Execute single test case"""
+        return _run_shard([test_case], self.engine)[0]
     
     def run_all_tests(self) -> TestReport:
         """Run all test cases"""
@@ -143,40 +261,59 @@ class TestRunner:
         results_by_category = {}
         all_results = []
         
-        categories = get_all_categories()
-        for category in sorted(categories):
-            print(f"\n{'='*80}")
-            print(f"Category: {category.upper()}")
-            print(f"{'='*80}")
+        # Group the cases by category in one pass
+        by_category = defaultdict(list)
+        for test_case in TEST_CASES:
+            by_category[test_case.category].append(test_case)
+        categories = sorted(by_category)
+        all_cases = [tc for cat in categories for tc in by_category[cat]]
+        computed = iter(self._run_cases(all_cases))
+        
+        # On a terminal lines are printed as they come; otherwise each
+        # category's lines are written to stdout in one go
+        interactive = sys.stdout.isatty()
+        lines: List[str] = []
+        out = print if interactive else lines.append
+        
+        for category in categories:
+            out(f"\n{'='*80}")
+            out(f"Category: {category.upper()}")
+            out(f"{'='*80}")
             
-            test_cases = get_test_cases_by_category(category)
+            test_cases = by_category[category]
             category_results = []
             
             for i, test_case in enumerate(test_cases, 1):
-                print(f"\n[{i}/{len(test_cases)}] {test_case.name}")
-                print(f"    {test_case.description}")
+                out(f"\n[{i}/{len(test_cases)}] {test_case.name}")
+                out(f"    {test_case.description}")
                 
-                result = self.run_test_case(test_case)
+                result = next(computed)
                 category_results.append(result)
                 all_results.append(result)
                 
                 # Print result
                 status = "✓ PASS" if result.passed else "✗ FAIL"
-                print(f"    {status} - {result.actual_questions} questions, {result.execution_time_ms:.2f}ms")
+                out(f"    {status} - {result.actual_questions} questions, {result.execution_time_ms:.2f}ms")
                 
                 if not result.passed:
                     for error in result.errors:
-                        print(f"      ERROR: {error}")
+                        out(f"      ERROR: {error}")
                 
                 if result.warnings:
                     for warning in result.warnings:
-                        print(f"      WARNING: {warning}")
+                        out(f"      WARNING: {warning}")
             
             results_by_category[category] = category_results
             
             # Category summary
             passed = sum(1 for r in category_results if r.passed)
-            print(f"\n    Category Summary: {passed}/{len(category_results)} passed")
+            out(f"\n    Category Summary: {passed}/{len(category_results)} passed")
+            
+            if not interactive:
+                lines.append("")
+                sys.stdout.write("\n".join(lines))
+                sys.stdout.flush()
+                lines.clear()
         
         # Generate overall report
         passed_count = sum(1 for r in all_results if r.passed)
@@ -206,21 +343,88 @@ class TestRunner:
         self._print_final_report(report)
         return report
     
+    def _run_cases(self, test_cases: List[TestCase]) -> List[TestResult]:
+        """Run test cases through answer tries, in input order
+
+        Cases are ordered so shared answer prefixes sit together. With at
+        least PARALLEL_MIN_CASES cases, several CPUs and a plain
+        OptimizedDecisionEngine, they are cut into one contiguous shard per
+        worker process, each evaluated as a single trie on a worker engine
+        built with the runner's engine options. Otherwise (including any
+        engine subclass) the runner's own engine evaluates them in-process.
+        """
+        order = sorted(range(len(test_cases)), key=lambda i: _prefix_key(test_cases[i].answers))
+        ordered = [test_cases[i] for i in order]
+        
+        results = None
+        workers = min(os.cpu_count() or 1, len(ordered))
+        if (workers > 1 and len(ordered) >= self.PARALLEL_MIN_CASES
+                and type(self.engine) is OptimizedDecisionEngine):
+            size = -(-len(ordered) // workers)
+            shards = [ordered[i:i + size] for i in range(0, len(ordered), size)]
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.engine._profile_guided_order,)) as ex:
+                    results = [r for shard in ex.map(_run_shard, shards) for r in shard]
+            except (OSError, NotImplementedError):
+                # No usable process pool on this platform; run in-process
+                pass
+        if results is None:
+            results = _run_shard(ordered, self.engine)
+        
+        self.results = [None] * len(test_cases)
+        for i, result in zip(order, results):
+            self.results[i] = result
+        return self.results
+    
+    def check_batch_evaluate(self, test_cases: List[TestCase]) -> List[str]:
+        """Compare engine.batch_evaluate with the interactive replay, per test case
+
+        Returns one error per case whose questions asked, flags,
+        obligations or result differ. batch_evaluate needs numpy; its
+        ImportError propagates when numpy is missing.
+        """
+        engine = self.engine
+        results = engine.batch_evaluate([engine.encode_answers(tc.answers) for tc in test_cases])
+        outcomes, _ = _evaluate_trie([tc.answers for tc in test_cases], engine)
+        
+        errors = []
+        for test_case, result, outcome in zip(test_cases, results, outcomes):
+            batch = (result.questions_asked, dict(result.flags), frozenset(result.obligations),
+                     _RESULT_NAMES[result.result])
+            if batch != outcome[:4]:
+                errors.append(f"{test_case.name}: batch_evaluate gave {batch}, "
+                              f"interactive replay gave {outcome[:4]}")
+        return errors
+    
     def _calculate_optimization_metrics(self, results: List[TestResult]) -> Dict[str, Any]:
         """Calculate optimization metrics from test results"""
         if not results:
             return {}
         
-        question_counts = [r.actual_questions for r in results]
-        avg_questions = sum(question_counts) / len(question_counts)
-        min_questions = min(question_counts)
-        max_questions = max(question_counts)
-        
-        # Calculate path distribution
+        # Question count totals, range, path distribution and execution
+        # time, gathered in a single pass
+        total_questions = 0
+        min_questions = max_questions = results[0].actual_questions
         path_distribution = {}
+        total_time_ms = 0.0
         for r in results:
-            key = r.actual_questions
-            path_distribution[key] = path_distribution.get(key, 0) + 1
+            q = r.actual_questions
+            total_questions += q
+            if q < min_questions:
+                min_questions = q
+            elif q > max_questions:
+                max_questions = q
+            path_distribution[q] = path_distribution.get(q, 0) + 1
+            total_time_ms += r.execution_time_ms
+        avg_questions = total_questions / len(results)
+        
+        # Median (upper, for even counts) from the cumulative distribution
+        cumulative = 0
+        for median_questions, count in sorted(path_distribution.items()):
+            cumulative += count
+            if cumulative > len(results) // 2:
+                break
         
         # Calculate estimated time savings (assuming 1 question = 30 seconds)
         original_avg = 10.2  # From theory
@@ -234,14 +438,14 @@ class TestRunner:
             'average_questions': round(avg_questions, 2),
             'min_questions': min_questions,
             'max_questions': max_questions,
-            'median_questions': sorted(question_counts)[len(question_counts)//2],
+            'median_questions': median_questions,
             'path_distribution': path_distribution,
             'original_avg_questions': original_avg,
             'questions_saved': round(original_avg - avg_questions, 2),
             'improvement_percentage': round((original_avg - avg_questions) / original_avg * 100, 1),
             'estimated_time_saved_seconds': round(time_saved, 1),
             'estimated_time_saved_percentage': round(time_saved_pct, 1),
-            'avg_execution_time_ms': round(sum(r.execution_time_ms for r in results) / len(results), 2)
+            'avg_execution_time_ms': round(total_time_ms / len(results), 2)
         }
     
     def _print_final_report(self, report: TestReport):
@@ -270,7 +474,7 @@ class TestRunner:
         print("\nPath Distribution:")
         for questions, count in sorted(metrics['path_distribution'].items()):
             pct = (count / report.total_tests * 100)
-            bar = "█" * int(pct / 2)
+            bar = _BAR[:int(pct / 2)]
             print(f"  {questions} questions: {count:2d} tests ({pct:5.1f}%) {bar}")
         
         print(f"\nEstimated Time Saved: {metrics['estimated_time_saved_seconds']}s per assessment")
@@ -295,61 +499,75 @@ class TestRunner:
     
     def export_report_markdown(self, report: TestReport, filename: str = "TEST_REPORT.md"):
         """Export test report as markdown"""
-        with open(filename, 'w') as f:
-            f.write("# EU AI Act Compliance Checker - Test Report\n\n")
-            f.write(f"**Generated:** {report.timestamp.isoformat()}\n\n")
-            
-            f.write("## Summary\n\n")
-            f.write(f"- **Total Tests:** {report.total_tests}\n")
-            f.write(f"- **Passed:** {report.passed} ✓\n")
-            f.write(f"- **Failed:** {report.failed} ✗\n")
-            f.write(f"- **Pass Rate:** {report.pass_rate:.1f}%\n\n")
-            
-            f.write("## Optimization Metrics\n\n")
-            metrics = report.optimization_metrics
-            f.write(f"| Metric | Value |\n")
-            f.write(f"|--------|-------|\n")
-            f.write(f"| Original Avg Questions | {metrics['original_avg_questions']} |\n")
-            f.write(f"| Optimized Avg Questions | {metrics['average_questions']} |\n")
-            f.write(f"| Questions Saved | {metrics['questions_saved']} |\n")
-            f.write(f"| Improvement | {metrics['improvement_percentage']}% |\n")
-            f.write(f"| Min Questions | {metrics['min_questions']} |\n")
-            f.write(f"| Max Questions | {metrics['max_questions']} |\n")
-            f.write(f"| Median Questions | {metrics['median_questions']} |\n")
-            f.write(f"| Avg Execution Time | {metrics['avg_execution_time_ms']:.2f}ms |\n\n")
-            
-            f.write("### Path Distribution\n\n")
-            f.write("```\n")
-            for questions, count in sorted(metrics['path_distribution'].items()):
-                pct = (count / report.total_tests * 100)
-                bar = "█" * int(pct / 2)
-                f.write(f"{questions} questions: {count:2d} tests ({pct:5.1f}%) {bar}\n")
-            f.write("```\n\n")
-            
-            f.write("## Results by Category\n\n")
-            for category, results in sorted(report.results_by_category.items()):
-                passed = sum(1 for r in results if r.passed)
-                f.write(f"### {category.replace('_', ' ').title()}\n\n")
-                f.write(f"**Status:** {passed}/{len(results)} passed\n\n")
-                
-                for result in results:
-                    status = "✓" if result.passed else "✗"
-                    f.write(f"- {status} **{result.test_case.name}**\n")
-                    f.write(f"  - {result.test_case.description}\n")
-                    f.write(f"  - Questions: {result.actual_questions}\n")
-                    f.write(f"  - Execution time: {result.execution_time_ms:.2f}ms\n")
-                    if result.errors:
-                        f.write(f"  - Errors: {', '.join(result.errors)}\n")
-                    f.write("\n")
-            
-            if report.errors_summary:
-                f.write("## Errors\n\n")
-                for error in report.errors_summary:
-                    f.write(f"- {error}\n")
-                f.write("\n")
+        # Assemble the report in memory and write it with a single call
+        buf = []
+        w = buf.append
+        w("# EU AI Act Compliance Checker - Test Report\n\n")
+        w(f"**Generated:** {report.timestamp.isoformat()}\n\n")
+        
+        w("## Summary\n\n")
+        w(f"- **Total Tests:** {report.total_tests}\n")
+        w(f"- **Passed:** {report.passed} ✓\n")
+        w(f"- **Failed:** {report.failed} ✗\n")
+        w(f"- **Pass Rate:** {report.pass_rate:.1f}%\n\n")
+        
+        w("## Optimization Metrics\n\n")
+        metrics = report.optimization_metrics
+        w(f"| Metric | Value |\n")
+        w(f"|--------|-------|\n")
+        w(f"| Original Avg Questions | {metrics['original_avg_questions']} |\n")
+        w(f"| Optimized Avg Questions | {metrics['average_questions']} |\n")
+        w(f"| Questions Saved | {metrics['questions_saved']} |\n")
+        w(f"| Improvement | {metrics['improvement_percentage']}% |\n")
+        w(f"| Min Questions | {metrics['min_questions']} |\n")
+        w(f"| Max Questions | {metrics['max_questions']} |\n")
+        w(f"| Median Questions | {metrics['median_questions']} |\n")
+        w(f"| Avg Execution Time | {metrics['avg_execution_time_ms']:.2f}ms |\n\n")
+        
+        w("### Path Distribution\n\n")
+        w("```\n")
+        for questions, count in sorted(metrics['path_distribution'].items()):
+            pct = (count / report.total_tests * 100)
+            bar = _BAR[:int(pct / 2)]
+            w(f"{questions} questions: {count:2d} tests ({pct:5.1f}%) {bar}\n")
+        w("```\n\n")
+        
+        w("## Results by Category\n\n")
+        for category, results in sorted(report.results_by_category.items()):
+            passed = sum(1 for r in results if r.passed)
+            w(f"### {category.replace('_', ' ').title()}\n\n")
+            w(f"**Status:** {passed}/{len(results)} passed\n\n")
             
-            f.write("---\n\n")
-            f.write(f"*Report generated on {report.timestamp.strftime('%Y-%m-%d %H:%M:%S')}*\n")
+            for result in results:
+                status = "✓" if result.passed else "✗"
+                w(f"- {status} **{result.test_case.name}**\n")
+                w(f"  - {result.test_case.description}\n")
+                w(f"  - Questions: {result.actual_questions}\n")
+                w(f"  - Execution time: {result.execution_time_ms:.2f}ms\n")
+                if result.errors:
+                    w(f"  - Errors: {', '.join(result.errors)}\n")
+                w("\n")
+        
+        if report.errors_summary:
+            w("## Errors\n\n")
+            for error in report.errors_summary:
+                w(f"- {error}\n")
+            w("\n")
+        
+        w("---\n\n")
+        w(f"*Report generated on {report.timestamp.strftime('%Y-%m-%d %H:%M:%S')}*\n")
+        
+        content = ''.join(buf)
+        
+        # Leave the file untouched when it already holds this report
+        try:
+            with open(filename) as f:
+                unchanged = f.read() == content
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            with open(filename, 'w') as f:
+                f.write(content)
         
         print(f"\nReport exported to {filename}")
 
@@ -359,8 +577,23 @@ def main():
     report = runner.run_all_tests()
     runner.export_report_markdown(report)
     
+    # Check the batch API against the same cases
+    print("\n" + "-"*80)
+    print("BATCH EVALUATION CHECK")
+    print("-"*80)
+    try:
+        batch_errors = runner.check_batch_evaluate(TEST_CASES)
+    except ImportError as e:
+        batch_errors = []
+        print(f"Skipped: {e}")
+    else:
+        agreed = len(TEST_CASES) - len(batch_errors)
+        print(f"batch_evaluate agrees with the interactive engine: {agreed}/{len(TEST_CASES)}")
+        for error in batch_errors:
+            print(f"  ERROR: {error}")
+    
     # Exit with appropriate code
-    sys.exit(0 if report.failed == 0 else 1)
+    sys.exit(0 if report.failed == 0 and not batch_errors else 1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -8,13 +8,32 @@ import json
 import yaml
 from typing import Dict, Any, List
 
+# libyaml's emitter when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def load_json(filepath: str) -> Dict:
     """Load JSON file"""
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def convert_to_yaml_structure(content_data: Dict, routing_data: Dict = None) -> Dict:
-    """Convert JSON structure to YAML format similar to use_case1"""
+def convert_to_yaml_structure(content_data: Dict, routing_data: Dict = None,
+                              stats: Dict = None) -> Dict:
+    """Convert JSON structure to YAML format similar to use_case1
+
+    If `stats` is given it is filled with the routing statistics of
+    analyze_routing in the same pass over the routing logic.
+    """
 
     yaml_data = {
         'metadata': {
@@ -31,23 +50,35 @@ def convert_to_yaml_structure(content_data: Dict, routing_data: Dict = None) ->
 
     # Get routing logic if available
     routing_logic = routing_data.get('questions_logic', {}) if routing_data else {}
+    routing_get = routing_logic.get
+    questionnaire = yaml_data['questionnaire']
+    if stats is not None:
+        stats.update(_new_routing_stats(routing_logic))
 
     # Convert questions
     for qid, q_data in content_data['questions_content'].items():
+        get = q_data.get
+        answers = get('answers') or {}
+        options = []
         question_entry = {
             'id': qid,
-            'question': q_data.get('secondary_title', q_data.get('main_title', '')),
-            'info': q_data.get('info', ''),
-            'type': 'single_choice' if len(q_data.get('answers', {})) <= 3 else 'multiple_choice',
-            'sources': q_data.get('sources', ''),
-            'options': []
+            'question': get('secondary_title', get('main_title', '')),
+            'info': get('info', ''),
+            'type': 'single_choice' if len(answers) <= 3 else 'multiple_choice',
+            'sources': get('sources', ''),
+            'options': options
         }
 
         # Get routing for this question
-        q_routing = routing_logic.get(qid, {})
+        q_routing = routing_get(qid)
+        if q_routing is None:
+            q_routing = {}
+        elif stats is not None:
+            _count_routing(stats, qid, q_routing)
 
         # Convert answers
-        for ans_key, ans_data in q_data.get('answers', {}).items():
+        options_by_value = {}
+        for ans_key, ans_data in answers.items():
             option = {
                 'value': ans_key,
                 'label': ans_data.get('label', ''),
@@ -62,7 +93,8 @@ def convert_to_yaml_structure(content_data: Dict, routing_data: Dict = None) ->
             if 'flags' in ans_data:
                 option['flags'] = ans_data['flags']
 
-            question_entry['options'].append(option)
+            options.append(option)
+            options_by_value[ans_key] = option
 
         # Add routing from routing JSON
         if q_routing and 'routing' in q_routing:
@@ -73,12 +105,18 @@ def convert_to_yaml_structure(content_data: Dict, routing_data: Dict = None) ->
             for ans_key, ans_flags in q_routing['answers'].items():
                 if 'set_flags' in ans_flags:
                     # Find matching option and add flags
-                    for opt in question_entry['options']:
-                        if opt['value'] == ans_key:
-                            opt['set_flags'] = ans_flags['set_flags']
-                            break
+                    opt = options_by_value.get(ans_key)
+                    if opt is not None:
+                        opt['set_flags'] = ans_flags['set_flags']
+
+        questionnaire[qid] = question_entry
 
-        yaml_data['questionnaire'][qid] = question_entry
+    if stats is not None:
+        # Routing-only questions (hubs) have no content entry
+        for qid, q_routing in routing_logic.items():
+            if qid not in questionnaire:
+                _count_routing(stats, qid, q_routing)
+        stats['condition_types'] = list(stats['condition_types'])
 
     # Convert flags/results
     for flag_id, flag_content in content_data['flags_content'].items():
@@ -96,11 +134,9 @@ def convert_to_yaml_structure(content_data: Dict, routing_data: Dict = None) ->
 
     return yaml_data
 
-def analyze_routing(routing_data: Dict) -> Dict:
-    """Analyze routing data for optimization summary"""
-    questions_logic = routing_data.get('questions_logic', {})
-
-    stats = {
+def _new_routing_stats(questions_logic: Dict) -> Dict:
+    """Empty routing statistics for analyze_routing"""
+    return {
         'total_questions': len(questions_logic),
         'end_points': 0,
         'qais_questions': 0,
@@ -108,19 +144,26 @@ def analyze_routing(routing_data: Dict) -> Dict:
         'condition_types': set()
     }
 
-    for qid, q_data in questions_logic.items():
-        if qid.startswith('QAIS'):
-            stats['qais_questions'] += 1
-        elif qid.startswith('QGPAI'):
-            stats['qgpai_questions'] += 1
-
-        for route in q_data.get('routing', []):
-            if route.get('go_to') == 'END':
-                stats['end_points'] += 1
-            for cond in route.get('conditions', []):
-                for key in cond.keys():
-                    stats['condition_types'].add(key)
+def _count_routing(stats: Dict, qid: str, q_data: Dict):
+    """Add one question's routing to the statistics"""
+    if qid.startswith('QAIS'):
+        stats['qais_questions'] += 1
+    elif qid.startswith('QGPAI'):
+        stats['qgpai_questions'] += 1
+
+    for route in q_data.get('routing', []):
+        if route.get('go_to') == 'END':
+            stats['end_points'] += 1
+        for cond in route.get('conditions', []):
+            for key in cond.keys():
+                stats['condition_types'].add(key)
 
+def analyze_routing(routing_data: Dict) -> Dict:
+    """Analyze routing data for optimization summary"""
+    questions_logic = routing_data.get('questions_logic', {})
+    stats = _new_routing_stats(questions_logic)
+    for qid, q_data in questions_logic.items():
+        _count_routing(stats, qid, q_data)
     stats['condition_types'] = list(stats['condition_types'])
     return stats
 
@@ -129,8 +172,10 @@ def main():
     content_data = load_json('checkerlogic_20260130.json')
     routing_data = load_json('checkerlogic_20260130_with_routing.json')
 
-    # Analyze routing
-    stats = analyze_routing(routing_data)
+    # Convert to YAML structure with routing, analyzing the routing in the same pass
+    stats = {}
+    yaml_data = convert_to_yaml_structure(content_data, routing_data, stats)
+
     print("\n=== Routing Analysis ===")
     print(f"Total questions with routing: {stats['total_questions']}")
     print(f"QAIS questions: {stats['qais_questions']}")
@@ -138,12 +183,9 @@ def main():
     print(f"END terminal states: {stats['end_points']}")
     print(f"Condition types: {stats['condition_types']}")
 
-    # Convert to YAML structure with routing
-    yaml_data = convert_to_yaml_structure(content_data, routing_data)
-
     # Write original YAML (with routing)
     with open('original_checker_ec.yaml', 'w', encoding='utf-8') as f:
-        yaml.dump(yaml_data, f, allow_unicode=True, default_flow_style=False, sort_keys=False, width=120)
+        yaml.dump(yaml_data, f, Dumper=_Dumper, allow_unicode=True, default_flow_style=False, sort_keys=False, width=120)
 
     print(f"\nConverted {len(yaml_data['questionnaire'])} questions")
     print(f"Converted {len(yaml_data['results'])} result flags")
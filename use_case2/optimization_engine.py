@@ -6,22 +6,36 @@ Analyzes EC Service Desk routing logic and generates optimized version
 
 import json
 import math
-from typing import Dict, List, Set, Tuple, Optional, Any
-from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Optional, Any, Callable, Iterable
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
-class PathResult:
-    """Represents a terminal path through the decision tree"""
-    questions: List[str]
-    answers: List[Tuple[str, Any]]
-    flags: Dict[str, Any]
-    end_state: str
-    path_length: int
 
+def _load_json(filepath: str) -> Dict:
+    """Load a JSON file, with orjson when it is installed"""
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
-@dataclass
+
+def _dump_json(data: Any, filepath: str):
+    """Write data as indented JSON, with orjson when it is installed"""
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+@dataclass(slots=True)
 class QuestionStats:
     """Statistics for a question"""
     id: str
@@ -30,6 +44,7 @@ class QuestionStats:
     terminal_probability: float = 0.0
     information_gain: float = 0.0
     avg_depth: float = 0.0
+    terminal_count: int = 0  # Paths that end right after this question
     condition_types: Set[str] = field(default_factory=set)
 
 
@@ -37,24 +52,54 @@ class ECRoutingAnalyzer:
     """Analyzes EC Service Desk routing logic"""
 
     def __init__(self, routing_file: str, content_file: str = None):
-        with open(routing_file, 'r', encoding='utf-8') as f:
-            self.routing_data = json.load(f)
+        self.routing_data = _load_json(routing_file)
 
         if content_file:
-            with open(content_file, 'r', encoding='utf-8') as f:
-                self.content_data = json.load(f)
+            self.content_data = _load_json(content_file)
         else:
             self.content_data = None
 
         self.questions_logic = self.routing_data.get('questions_logic', {})
-        self.all_paths: List[PathResult] = []
+        # Question -> its track: 'QAIS' (AI system), 'QGPAI' (GPAI model) or 'OTHER'
+        self._track: Dict[str, str] = {
+            qid: 'QAIS' if qid.startswith('QAIS') else 'QGPAI' if qid.startswith('QGPAI') else 'OTHER'
+            for qid in self.questions_logic
+        }
         self.question_stats: Dict[str, QuestionStats] = {}
+        # Terminal paths are not kept: each one is folded into these
+        # summaries as it is enumerated (see _record_path)
+        self.total_paths = 0
+        self._path_lengths: Dict[int, int] = defaultdict(int)  # length -> paths
+        self._path_length_total = 0
+        self._terminal_counts: Dict[int, int] = {}  # final flag state id -> paths
+        # Question -> its first answer on a path -> final flag state id -> paths
+        self._answer_terminals: Dict[str, Dict[Any, Dict[int, int]]] = {}
+        # Flag states seen during enumeration, interned: id -> flags and
+        # frozenset of flag items -> id
+        self._flag_states: List[Dict[str, Any]] = []
+        self._flag_intern: Dict[frozenset, int] = {}
+        # Question -> its answers as (answer key, answer set_flags, routes that
+        # answer can take as (flag predicate or None, route set_flags, go_to));
+        # filled as questions are reached (see _index_question)
+        self._q_index: Dict[str, List[Tuple[str, Optional[List[Dict]],
+                                            List[Tuple[Optional[Callable[[Dict], bool]], Optional[List[Dict]], str]]]]] = {}
+        # (question, flag state id, depth) -> its (answer key, child key) edges
+        # that lead to END (None at END), the visit counts of the subtree
+        # below it and its number of paths to END
+        self._routing_graph: Dict[Tuple[str, int, int],
+                                  Tuple[Optional[List[tuple]], Dict[str, int], int]] = {}
 
     def analyze(self) -> Dict[str, Any]:
         """Run full analysis"""
-        # Initialize stats for all questions
+        # Without an entry question there is nothing to enumerate
+        if not self.questions_logic.get('Q1'):
+            return self._generate_report()
+
+        # Initialize stats for the questions reachable from Q1
+        reachable = self._reachable_questions('Q1')
         for qid in self.questions_logic:
-            self.question_stats[qid] = QuestionStats(id=qid)
+            if qid in reachable:
+                self.question_stats[qid] = QuestionStats(id=qid)
 
         # Enumerate all paths
         self._enumerate_paths('Q1', [], [], {})
@@ -64,6 +109,19 @@ class ECRoutingAnalyzer:
 
         return self._generate_report()
 
+    def _reachable_questions(self, start: str) -> Set[str]:
+        """Questions reachable from start through any route, ignoring conditions"""
+        reachable = {start}
+        stack = [start]
+        while stack:
+            q_logic = self.questions_logic.get(stack.pop(), {})
+            for route in q_logic.get('routing', []):
+                next_q = route.get('go_to')
+                if next_q and next_q != 'END' and next_q not in reachable:
+                    reachable.add(next_q)
+                    stack.append(next_q)
+        return reachable
+
     def _enumerate_paths(self,
                          current_q: str,
                          path: List[str],
@@ -71,114 +129,256 @@ class ECRoutingAnalyzer:
                          flags: Dict[str, Any],
                          depth: int = 0,
                          max_depth: int = 20):
-        """Recursively enumerate all possible paths"""
-        if depth > max_depth:
-            return
-
-        if current_q == 'END':
-            self.all_paths.append(PathResult(
-                questions=path.copy(),
-                answers=answers.copy(),
-                flags=flags.copy(),
-                end_state='END',
-                path_length=len(path)
-            ))
-            return
-
-        q_logic = self.questions_logic.get(current_q)
-        if not q_logic:
-            return
-
-        path.append(current_q)
+        """Enumerate all possible paths from current_q, streaming each to _record_path"""
+        root = self._build_routing_graph(current_q, self._intern_flags(dict(flags)),
+                                         depth, max_depth)
+        graph = self._routing_graph
 
         # Update question stats
-        if current_q in self.question_stats:
-            self.question_stats[current_q].total_visits += 1
+        for qid, count in graph[root][1].items():
+            self.question_stats[qid].total_visits += count
+
+        # Depth-first walk over the graph; `questions` and `path_answers`
+        # hold the current path and each stack entry is a key with the
+        # index of its next edge to follow
+        questions = list(path)
+        path_answers = list(answers)
+        stack = [(root, 0)]
+        while stack:
+            key, i = stack.pop()
+            edges = graph[key][0]
+            if edges is None:
+                self._record_path(questions, path_answers, key[1])
+            elif i < len(edges):
+                stack.append((key, i + 1))
+                ans_key, child = edges[i]
+                questions.append(key[0])
+                path_answers.append((key[0], ans_key))
+                stack.append((child, 0))
+                continue
+            # Leaving key: drop the edge that led to it
+            if stack:
+                questions.pop()
+                path_answers.pop()
+
+    def _record_path(self, questions: List[str], answers: List[Tuple[str, Any]],
+                     end_state_id: int):
+        """Fold one terminal path into the path, question and terminal state summaries"""
+        self.total_paths += 1
+        length = len(questions)
+        self._path_lengths[length] += 1
+        self._path_length_total += length
+        self._terminal_counts[end_state_id] = self._terminal_counts.get(end_state_id, 0) + 1
+
+        # Count paths through each question, and the path's end at its last one
+        question_stats = self.question_stats
+        stats = None
+        for depth, qid in enumerate(questions, 1):
+            stats = question_stats.get(qid)
+            if stats is not None:
+                stats.paths_through += 1
+                stats.avg_depth += depth
+        if stats is not None:
+            stats.terminal_count += 1
+
+        # Terminal states per answer, by each question's first answer on the path
+        seen = set()
+        for q, a in answers:
+            if q in seen:
+                continue
+            seen.add(q)
+            partitions = self._answer_terminals.get(q)
+            if partitions is None:
+                partitions = self._answer_terminals[q] = {}
+            partition_terminals = partitions.get(a)
+            if partition_terminals is None:
+                partition_terminals = partitions[a] = {}
+            partition_terminals[end_state_id] = partition_terminals.get(end_state_id, 0) + 1
+
+    def _intern_flags(self, flags: Dict[str, Any]) -> int:
+        """Id of a flag state; equal states share one id (and one dict)"""
+        key = frozenset(flags.items())
+        state_id = self._flag_intern.get(key)
+        if state_id is None:
+            state_id = self._flag_intern[key] = len(self._flag_states)
+            self._flag_states.append(flags)
+        return state_id
+
+    def _set_flags(self, state_id: int, set_flags: List[Dict[str, Any]]) -> int:
+        """Id of the flag state after applying `set_flags` to state `state_id`"""
+        flags = self._flag_states[state_id]
+        copied = False
+        for flag in set_flags:
+            name, value = flag['flag_name'], flag['value']
+            if name in flags and flags[name] == value:
+                continue
+            # Copy on write: states are shared, so copy only once a flag changes
+            if not copied:
+                flags = flags.copy()
+                copied = True
+            flags[name] = value
+        return self._intern_flags(flags) if copied else state_id
+
+    def _build_routing_graph(self, current_q: str, flag_state: int,
+                             depth: int, max_depth: int) -> Tuple[str, int, int]:
+        """
+        Expand the routing graph below current_q into _routing_graph, memoized.
+
+        The paths below a question depend only on the question, the flags
+        set so far and the depth (for max_depth), not on how it was
+        reached, so each such subtree is expanded once. Flags are passed
+        as interned state ids. Each key records its edges in answer order
+        (None at END, empty at dead ends) and how many times each question
+        is visited while enumerating the paths below it; edges into
+        subtrees without paths to END are dropped. Returns the root key.
+
+        The traversal is an iterative post-order walk over an explicit
+        stack of (question, flag state, depth) keys: a key is combined once
+        all of its children are in _routing_graph. Every edge increases the
+        depth, so keys never form a cycle.
+        """
+        graph = self._routing_graph
+        root = (current_q, flag_state, depth)
+        # Key -> its (answer key, child key) edges, for keys awaiting children
+        pending: Dict[Tuple[str, int, int], List[Tuple[str, Tuple[str, int, int]]]] = {}
+        stack = [root]
+        while stack:
+            key = stack[-1]
+            if key in graph:
+                stack.pop()
+                continue
 
+            edges = pending.get(key)
+            if edges is None:
+                q, state, d = key
+                if d > max_depth:
+                    graph[key] = ([], {}, 0)
+                elif q == 'END':
+                    graph[key] = (None, {}, 1)
+                elif not self.questions_logic.get(q):
+                    graph[key] = ([], {}, 0)
+                else:
+                    edges = pending[key] = [(ans_key, (next_q, new_state, d + 1))
+                                            for ans_key, next_q, new_state in self._branches(q, state)]
+                    # Children are pushed in reverse so they are expanded in answer order
+                    stack.extend(child for _, child in reversed(edges) if child not in graph)
+                continue
+
+            # All children are expanded: combine their visit counts, and keep
+            # only the edges with paths below them so walks skip dead ends
+            del pending[key]
+            stack.pop()
+            visits: Dict[str, int] = {key[0]: 1}
+            live_edges = []
+            paths = 0
+            for edge in edges:
+                _, child_visits, child_paths = graph[edge[1]]
+                for qid, count in child_visits.items():
+                    visits[qid] = visits.get(qid, 0) + count
+                if child_paths:
+                    live_edges.append(edge)
+                    paths += child_paths
+            graph[key] = (live_edges, visits, paths)
+
+        return root
+
+    def _branches(self, current_q: str, flag_state: int) -> List[Tuple[str, str, int]]:
+        """(answer key, next question, flag state id) for each routable answer to current_q"""
         # Get all possible routing outcomes
-        routing = q_logic.get('routing', [])
-        q_answers = q_logic.get('answers', {})
+        answers = self._q_index.get(current_q)
+        if answers is None:
+            answers = self._q_index[current_q] = self._index_question(self.questions_logic[current_q])
+        flag_states = self._flag_states
+        set_flags = self._set_flags
 
         # Simulate each possible answer
-        for ans_key in q_answers.keys():
-            new_flags = flags.copy()
+        branches = []
+        for ans_key, ans_set_flags, routes in answers:
+            new_state = flag_state
 
             # Apply answer-level flags
-            ans_data = q_answers[ans_key]
-            if 'set_flags' in ans_data:
-                for flag in ans_data['set_flags']:
-                    new_flags[flag['flag_name']] = flag['value']
+            if ans_set_flags is not None:
+                new_state = set_flags(new_state, ans_set_flags)
 
             # Find matching routing rule
             next_q = None
-            for route in routing:
-                if self._matches_conditions(route.get('conditions', []),
-                                           int(ans_key), new_flags):
+            new_flags = flag_states[new_state]
+            for flags_match, route_set_flags, go_to in routes:
+                if flags_match is None or flags_match(new_flags):
                     # Apply route-level flags
-                    if 'set_flags' in route:
-                        for flag in route['set_flags']:
-                            new_flags[flag['flag_name']] = flag['value']
-                    next_q = route['go_to']
+                    if route_set_flags is not None:
+                        new_state = set_flags(new_state, route_set_flags)
+                    next_q = go_to
                     break
 
             if next_q:
-                new_answers = answers + [(current_q, ans_key)]
-                self._enumerate_paths(next_q, path, new_answers, new_flags, depth + 1)
-
-        path.pop()
-
-    def _matches_conditions(self, conditions: List[Dict],
-                           answer: int, flags: Dict) -> bool:
-        """Check if conditions match"""
-        if not conditions:
-            return True
-
-        for cond in conditions:
-            if 'answer_is' in cond:
-                if cond['answer_is'] != answer:
-                    return False
-            elif 'if_any_answer_in' in cond:
-                if answer not in cond['if_any_answer_in']:
-                    return False
-            elif 'flag_equals' in cond:
-                flag_cond = cond['flag_equals']
-                flag_name = flag_cond['flag_name']
-                flag_value = flag_cond['value']
-                if flags.get(flag_name) != flag_value:
-                    return False
-            elif 'is_this_exact_match_selected' in cond:
-                # This is for checkbox questions - simplified check
-                pass
-            elif 'if_none_selected_in' in cond:
-                # This is for exclusion - simplified check
-                pass
-
-        return True
+                branches.append((ans_key, next_q, new_state))
+        return branches
+
+    @staticmethod
+    def _index_question(q_logic: Dict) -> List[Tuple[str, Optional[List[Dict]], List[tuple]]]:
+        """
+        Flatten a question's answers and routes, resolved per answer, into tuples.
+
+        A route matches when all of its conditions hold. Each condition is
+        checked by the first key it has: answer_is (the answer equals the
+        value), if_any_answer_in (the answer is in the list) or flag_equals
+        (the flag currently has the value). is_this_exact_match_selected and
+        if_none_selected_in are simplified to always match, and a route with
+        no conditions always matches.
+
+        Answer conditions depend only on the answer, so they are evaluated
+        here once for each answer key. Each answer keeps the
+        routes it can take, in order, with their flag_equals conditions
+        compiled to one predicate(flags) (None when there are none); routes
+        after one that always matches are dropped. set_flags lists are None
+        when absent, so the enumeration reads plain tuples, not dicts.
+        """
+        routing = q_logic.get('routing', [])
+        index = []
+        for ans_key, ans_data in q_logic.get('answers', {}).items():
+            answer = int(ans_key)
+            candidates = []
+            for route in routing:
+                flag_tests = []
+                for cond in route.get('conditions', []):
+                    if 'answer_is' in cond:
+                        if cond['answer_is'] != answer:
+                            break
+                    elif 'if_any_answer_in' in cond:
+                        if answer not in cond['if_any_answer_in']:
+                            break
+                    elif 'flag_equals' in cond:
+                        flag_cond = cond['flag_equals']
+                        flag_tests.append((flag_cond['flag_name'], flag_cond['value']))
+                    # is_this_exact_match_selected / if_none_selected_in always match
+                else:
+                    if not flag_tests:
+                        flags_match = None
+                    elif len(flag_tests) == 1:
+                        (name, value), = flag_tests
+                        flags_match = lambda f, _name=name, _value=value: f.get(_name) == _value
+                    else:
+                        flags_match = (lambda f, _tests=tuple(flag_tests):
+                                       all(f.get(name) == value for name, value in _tests))
+                    candidates.append((flags_match, route.get('set_flags'), route['go_to']))
+                    if flags_match is None:
+                        break
+            index.append((ans_key, ans_data.get('set_flags'), candidates))
+        return index
 
     def _calculate_stats(self):
-        """Calculate statistics from enumerated paths"""
-        total_paths = len(self.all_paths)
-        if total_paths == 0:
+        """Calculate statistics from the enumerated path summaries"""
+        if self.total_paths == 0:
             return
 
-        # Count paths through each question
-        for path_result in self.all_paths:
-            for i, qid in enumerate(path_result.questions):
-                if qid in self.question_stats:
-                    self.question_stats[qid].paths_through += 1
-                    self.question_stats[qid].avg_depth += (i + 1)
-
         # Calculate averages and probabilities
         for qid, stats in self.question_stats.items():
             if stats.paths_through > 0:
                 stats.avg_depth /= stats.paths_through
 
             # Terminal probability: how often does answering this question lead to END
-            terminal_count = sum(
-                1 for p in self.all_paths
-                if len(p.questions) > 0 and p.questions[-1] == qid
-            )
-            stats.terminal_probability = terminal_count / max(stats.paths_through, 1)
+            stats.terminal_probability = stats.terminal_count / max(stats.paths_through, 1)
 
         # Calculate information gain (simplified)
         self._calculate_information_gain()
@@ -193,64 +393,48 @@ class ECRoutingAnalyzer:
 
     def _calculate_information_gain(self):
         """Calculate information gain for each question"""
-        # Count terminal states
-        terminal_states = defaultdict(int)
-        for path in self.all_paths:
-            # Use flags as terminal state identifier
-            state_key = tuple(sorted(path.flags.items()))
-            terminal_states[state_key] += 1
-
-        total = len(self.all_paths)
+        total = self.total_paths
         if total == 0:
             return
 
-        # Calculate overall entropy
-        overall_entropy = self._entropy([c/total for c in terminal_states.values()])
+        # Calculate overall entropy over the terminal states (the paths'
+        # final flag states), counted in order of first appearance
+        overall_entropy = self._entropy(self._terminal_counts.values(), total)
 
         # For each question, calculate conditional entropy
         for qid in self.question_stats:
-            # Partition paths by this question's answer
-            partitions = defaultdict(list)
-            for path in self.all_paths:
-                answer = None
-                for q, a in path.answers:
-                    if q == qid:
-                        answer = a
-                        break
-                if answer is not None:
-                    partitions[answer].append(path)
-
-            if not partitions:
+            # Paths partitioned by this question's answer, with terminal
+            # state counts per partition
+            partitions = self._answer_terminals.get(qid)
+            if partitions is None:
                 continue
 
             # Calculate conditional entropy
             conditional_entropy = 0.0
-            for answer, paths in partitions.items():
-                prob = len(paths) / total
-                # Count terminal states for this partition
-                partition_terminals = defaultdict(int)
-                for p in paths:
-                    state_key = tuple(sorted(p.flags.items()))
-                    partition_terminals[state_key] += 1
-                part_total = len(paths)
-                if part_total > 0:
-                    part_entropy = self._entropy([c/part_total for c in partition_terminals.values()])
-                    conditional_entropy += prob * part_entropy
+            for partition_terminals in partitions.values():
+                counts = partition_terminals.values()
+                part_total = sum(counts)
+                prob = part_total / total
+                part_entropy = self._entropy(counts, part_total)
+                conditional_entropy += prob * part_entropy
 
             self.question_stats[qid].information_gain = overall_entropy - conditional_entropy
 
-    def _entropy(self, probs: List[float]) -> float:
-        """Calculate Shannon entropy"""
-        return -sum(p * math.log2(p) for p in probs if p > 0)
+    @staticmethod
+    def _entropy(counts: Iterable[int], total: int) -> float:
+        """Calculate Shannon entropy of positive counts out of total"""
+        # Counts come from paths actually seen, so every p is > 0 and no
+        # probability list or zero filter is needed
+        log2 = math.log2
+        return -sum(c / total * log2(c / total) for c in counts)
 
     def _generate_report(self) -> Dict[str, Any]:
         """Generate optimization report"""
-        total_paths = len(self.all_paths)
-        path_lengths = [p.path_length for p in self.all_paths]
+        total_paths = self.total_paths
+        path_analysis = self._path_length_summary()
 
         # Group questions by track
-        qais_questions = [qid for qid in self.questions_logic if qid.startswith('QAIS')]
-        qgpai_questions = [qid for qid in self.questions_logic if qid.startswith('QGPAI')]
+        track_sizes = Counter(self._track.values())
 
         # Count END states
         end_count = sum(1 for qid, q in self.questions_logic.items()
@@ -276,34 +460,31 @@ class ECRoutingAnalyzer:
         # Identify optimization opportunities
         optimizations = self._identify_optimizations()
 
+        rounded = self._rounded_stats()
+
         report = {
             'summary': {
                 'total_questions': len(self.questions_logic),
-                'qais_questions': len(qais_questions),
-                'qgpai_questions': len(qgpai_questions),
-                'other_questions': len(self.questions_logic) - len(qais_questions) - len(qgpai_questions),
+                'qais_questions': track_sizes['QAIS'],
+                'qgpai_questions': track_sizes['QGPAI'],
+                'other_questions': track_sizes['OTHER'],
                 'end_states': end_count,
                 'total_paths_enumerated': total_paths,
             },
-            'path_analysis': {
-                'shortest_path': min(path_lengths) if path_lengths else 0,
-                'longest_path': max(path_lengths) if path_lengths else 0,
-                'average_path': sum(path_lengths) / len(path_lengths) if path_lengths else 0,
-                'median_path': sorted(path_lengths)[len(path_lengths)//2] if path_lengths else 0,
-            },
+            'path_analysis': path_analysis,
             'early_terminations': early_terminations,
             'top_information_gain': [
-                {'question': q.id, 'ig': round(q.information_gain, 4),
-                 'paths': q.paths_through, 'terminal_prob': round(q.terminal_probability, 3)}
+                {'question': q.id, 'ig': rounded[q.id][2],
+                 'paths': q.paths_through, 'terminal_prob': rounded[q.id][1]}
                 for q in sorted_by_ig[:10]
             ],
             'optimizations': optimizations,
             'question_details': {
                 qid: {
                     'paths_through': stats.paths_through,
-                    'avg_depth': round(stats.avg_depth, 2),
-                    'terminal_probability': round(stats.terminal_probability, 3),
-                    'information_gain': round(stats.information_gain, 4),
+                    'avg_depth': rounded[qid][0],
+                    'terminal_probability': rounded[qid][1],
+                    'information_gain': rounded[qid][2],
                     'condition_types': list(stats.condition_types)
                 }
                 for qid, stats in self.question_stats.items()
@@ -312,24 +493,60 @@ class ECRoutingAnalyzer:
 
         return report
 
+    def _rounded_stats(self) -> Dict[str, Tuple[float, float, float]]:
+        """Question -> (avg_depth, terminal_probability, information_gain) rounded for output"""
+        return {
+            qid: (round(stats.avg_depth, 2), round(stats.terminal_probability, 3),
+                  round(stats.information_gain, 4))
+            for qid, stats in self.question_stats.items()
+        }
+
+    def _path_length_summary(self) -> Dict[str, Any]:
+        """Shortest, longest, average and median path length from the length histogram"""
+        if not self.total_paths:
+            return {'shortest_path': 0, 'longest_path': 0, 'average_path': 0, 'median_path': 0}
+
+        # Path lengths are small ints, so the histogram gives the median
+        # without sorting every length
+        histogram = self._path_lengths
+        count = self.total_paths
+
+        # Upper median for even counts, as sorted(lengths)[count // 2]
+        cumulative = 0
+        for median, n in sorted(histogram.items()):
+            cumulative += n
+            if cumulative > count // 2:
+                break
+
+        return {
+            'shortest_path': min(histogram),
+            'longest_path': max(histogram),
+            'average_path': self._path_length_total / count,
+            'median_path': median,
+        }
+
     def _identify_optimizations(self) -> List[Dict[str, Any]]:
         """Identify optimization opportunities"""
         optimizations = []
 
-        # 1. Questions that can be consolidated (similar routing patterns)
+        # 1. Questions that can be consolidated (identical routing: same
+        #    conditions and destinations, route by route)
         routing_patterns = defaultdict(list)
         for qid, q in self.questions_logic.items():
             routing = q.get('routing', [])
-            pattern = tuple((tuple(r.get('conditions', [])), r.get('go_to'))
-                          for r in routing[:3])  # First 3 routes
-            routing_patterns[len(pattern)].append(qid)
+            if not routing:
+                continue
+            pattern = tuple((tuple(json.dumps(cond, sort_keys=True) for cond in r.get('conditions', [])),
+                             r.get('go_to'))
+                            for r in routing)
+            routing_patterns[pattern].append(qid)
 
-        for count, questions in routing_patterns.items():
-            if len(questions) > 1 and count > 0:
+        for questions in routing_patterns.values():
+            if len(questions) > 1:
                 optimizations.append({
                     'type': 'consolidation_candidate',
                     'questions': questions[:5],
-                    'description': f'{len(questions)} questions with similar routing complexity'
+                    'description': f'{len(questions)} questions with identical routing'
                 })
 
         # 2. Questions with high terminal probability (good for early termination)
@@ -391,27 +608,33 @@ class ECRoutingAnalyzer:
 
         scored_questions.sort(key=lambda x: x[1], reverse=True)
 
+        # Split the ranking by track; each track keeps its ranked order
+        tracks: Dict[str, List[str]] = defaultdict(list)
+        for qid, _, _ in scored_questions:
+            tracks[self._track[qid]].append(qid)
+
+        rounded = self._rounded_stats()
         return {
             'optimized_order': [
                 {
                     'question': qid,
                     'score': round(score, 3),
-                    'original_avg_depth': round(stats.avg_depth, 2),
-                    'terminal_prob': round(stats.terminal_probability, 3),
-                    'ig': round(stats.information_gain, 4)
+                    'original_avg_depth': rounded[qid][0],
+                    'terminal_prob': rounded[qid][1],
+                    'ig': rounded[qid][2]
                 }
-                for qid, score, stats in scored_questions
+                for qid, score, _ in scored_questions
             ],
-            'recommended_flow': self._generate_recommended_flow(scored_questions)
+            'recommended_flow': self._generate_recommended_flow(tracks)
         }
 
-    def _generate_recommended_flow(self, scored_questions: List) -> Dict[str, Any]:
-        """Generate recommended optimized flow"""
+    def _generate_recommended_flow(self, tracks: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Generate recommended optimized flow from the ranked questions of each track"""
         # Keep the first question (Q1) as entry point
         # Then group by track (QAIS/QGPAI)
 
-        qais_optimized = [q for q, _, _ in scored_questions if q.startswith('QAIS')]
-        qgpai_optimized = [q for q, _, _ in scored_questions if q.startswith('QGPAI')]
+        qais_optimized = tracks.get('QAIS', [])
+        qgpai_optimized = tracks.get('QGPAI', [])
 
         return {
             'entry': 'Q1',
@@ -491,11 +714,8 @@ def main():
         print(f"  - {k}: {v}")
 
     # Save full report
-    with open('optimization_report.json', 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
-
-    with open('optimized_flow.json', 'w', encoding='utf-8') as f:
-        json.dump(optimized, f, indent=2, ensure_ascii=False)
+    _dump_json(report, 'optimization_report.json')
+    _dump_json(optimized, 'optimized_flow.json')
 
     print("\n📁 OUTPUT FILES")
     print("-" * 40)